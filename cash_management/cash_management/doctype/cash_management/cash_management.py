@@ -1,9 +1,263 @@
 # Copyright (c) 2025, chris.panikulangara@finbyz.tech and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
+from frappe.utils import flt, now
+
+from cash_management.cash_management.utils import payment_list
+
+# Cash Management is the read model behind the Payment Management pages: one row per
+# Payment Request / Payment Requester with tracker, payment and Purchase Order figures
+# already joined in. Rows are kept current by the doc_events in hooks.py and can be
+# rebuilt from scratch with `bench --site <site> rebuild-cash-management`.
+
+SOURCE_DOCTYPES = ("Payment Request", "Payment Requester")
+
+READ_MODEL_FIELDS = [
+	"source_doctype",
+	"source_name",
+	"payment_request_id",
+	"payment_request_type",
+	"transaction_date",
+	"status",
+	"request_docstatus",
+	"party_type",
+	"party",
+	"party_name",
+	"reference_doctype",
+	"reference_name",
+	"purchase_order",
+	"grand_total",
+	"payment_terms_summary",
+	"po_grand_total",
+	"po_remaining",
+	"tracker",
+	"payment_entry_id",
+	"budget",
+	"paid_amount",
+	"outstanding",
+]
 
 
 class CashManagement(Document):
 	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Cash Management", ["source_doctype", "transaction_date", "source_name"])
+	frappe.db.add_index("Cash Management", ["party", "source_doctype", "transaction_date"])
+
+
+def refresh_cash_management(source_doctype, names):
+	"""Recompute the read model rows of the given Payment Requests / Payment Requesters."""
+	names = {name for name in names if name}
+	if not names:
+		return
+
+	rows = build_read_model_rows(source_doctype, get_sources(source_doctype, names))
+	existing = dict(
+		frappe.db.sql(
+			"""
+			SELECT source_name, name
+			FROM `tabCash Management`
+			WHERE source_doctype = %s AND source_name IN %s
+			""",
+			(source_doctype, tuple(names)),
+		)
+	)
+
+	removed = [existing[name] for name in existing if name not in rows]
+	if removed:
+		delete_read_model_rows({"name": ("in", removed)})
+
+	for source_name, values in rows.items():
+		if source_name in existing:
+			frappe.db.set_value("Cash Management", existing[source_name], values)
+
+	insert_read_model_rows([values for source_name, values in rows.items() if source_name not in existing])
+
+
+def rebuild_cash_management(chunk_size=1000):
+	"""
+	Drop and repopulate the whole read model, committing after every chunk.
+
+	Only rows owned by the read model (with a source document) are replaced; Cash
+	Management records entered by hand are left alone.
+	"""
+	delete_read_model_rows({"source_doctype": ("in", SOURCE_DOCTYPES), "source_name": ("is", "set")})
+	frappe.db.commit()
+
+	for source_doctype in SOURCE_DOCTYPES:
+		last_name = ""
+		while True:
+			names = frappe.db.sql_list(
+				f"""
+				SELECT name FROM `tab{source_doctype}`
+				WHERE name > %s
+				ORDER BY name
+				LIMIT %s
+				""",
+				(last_name, chunk_size),
+			)
+			if not names:
+				break
+
+			rows = build_read_model_rows(source_doctype, get_sources(source_doctype, names))
+			insert_read_model_rows(list(rows.values()))
+			frappe.db.commit()
+			last_name = names[-1]
+
+
+def delete_read_model_rows(filters):
+	"""Delete Cash Management rows matching `filters` together with their payment terms rows."""
+	names = frappe.get_all("Cash Management", filters=filters, pluck="name")
+	for start in range(0, len(names), 1000):
+		chunk = names[start : start + 1000]
+		frappe.db.delete(
+			"Payment Schedule",
+			{"parenttype": "Cash Management", "parentfield": "payment_terms", "parent": ("in", chunk)},
+		)
+		frappe.db.delete("Cash Management", {"name": ("in", chunk)})
+
+
+def delete_orphaned_payment_terms():
+	"""Payment terms rows left behind by Cash Management rows deleted without them."""
+	frappe.db.sql(
+		"""
+		DELETE ps
+		FROM `tabPayment Schedule` ps
+		LEFT JOIN `tabCash Management` cm
+		ON cm.name = ps.parent
+		WHERE ps.parenttype = 'Cash Management'
+		AND cm.name IS NULL
+		"""
+	)
+
+
+@frappe.whitelist()
+def enqueue_rebuild_cash_management():
+	frappe.only_for("System Manager")
+	frappe.enqueue(
+		rebuild_cash_management,
+		queue="long",
+		timeout=3600,
+		job_id="cash_management::rebuild_cash_management",
+		deduplicate=True,
+	)
+
+
+def get_sources(source_doctype, names):
+	fields = [*payment_list.PAYMENT_REQUEST_FIELDS, "docstatus", "payment_request_type"]
+	if source_doctype == "Payment Request":
+		fields.append("status")
+
+	return frappe.get_all(source_doctype, filters={"name": ["in", list(names)]}, fields=fields)
+
+
+def build_read_model_rows(source_doctype, sources):
+	"""Read model values keyed by source name, enriched in bulk by `payment_list`."""
+	if source_doctype == "Payment Request":
+		enriched = payment_list.build_payment_request_rows(sources)
+	else:
+		enriched = payment_list.build_payment_requester_rows(sources)
+
+	rows = {}
+	for source, row in zip(sources, enriched, strict=True):
+		rows[source.name] = {
+			"source_doctype": source_doctype,
+			"source_name": source.name,
+			"payment_request_id": source.name if source_doctype == "Payment Request" else None,
+			"payment_request_type": source.payment_request_type,
+			"transaction_date": source.transaction_date,
+			"status": source.get("status"),
+			"request_docstatus": source.docstatus,
+			"party_type": source.party_type,
+			"party": source.party,
+			"party_name": source.party_name,
+			"reference_doctype": source.reference_doctype,
+			"reference_name": source.reference_name,
+			"purchase_order": source.reference_name if source.reference_doctype == "Purchase Order" else None,
+			"grand_total": flt(row["grand_total"]),
+			"payment_terms_summary": row["payment_terms"],
+			"po_grand_total": flt(row["po_grand_total"]),
+			"po_remaining": flt(row["po_remaining"]),
+			"tracker": row["tracker"],
+			"payment_entry_id": row["payment_entry"],
+			"budget": flt(row["budget"]),
+			"paid_amount": flt(row["total_amount_paid"]),
+			"outstanding": flt(row["total_amount_remaining"]),
+		}
+	return rows
+
+
+def insert_read_model_rows(rows):
+	if not rows:
+		return
+
+	timestamp = now()
+	user = frappe.session.user
+	frappe.db.bulk_insert(
+		"Cash Management",
+		["name", "creation", "modified", "owner", "modified_by", "docstatus", *READ_MODEL_FIELDS],
+		[
+			[frappe.generate_hash(length=10), timestamp, timestamp, user, user, 0]
+			+ [row[field] for field in READ_MODEL_FIELDS]
+			for row in rows
+		],
+	)
+
+
+def on_source_update(doc, method=None):
+	"""doc_events hook for Payment Request / Payment Requester."""
+	refresh_cash_management(doc.doctype, [doc.name])
+
+
+def on_source_trash(doc, method=None):
+	delete_read_model_rows({"source_doctype": doc.doctype, "source_name": doc.name})
+
+
+def on_payment_entry_update(doc, method=None):
+	"""doc_events hook for Payment Entry: refresh every request whose paid figures may change."""
+	payment_requests = {doc.get("reference_no")}
+	purchase_orders = set()
+	for ref in doc.get("references") or []:
+		if ref.reference_doctype == "Payment Request":
+			payment_requests.add(ref.reference_name)
+		elif ref.reference_doctype == "Purchase Order":
+			purchase_orders.add(ref.reference_name)
+		payment_requests.add(ref.get("payment_request"))
+
+	if purchase_orders:
+		# PO remaining is shown on every request against the Purchase Order
+		payment_requests.update(
+			frappe.get_all(
+				"Cash Management",
+				filters={"purchase_order": ["in", list(purchase_orders)]},
+				pluck="source_name",
+			)
+		)
+
+	refresh_cash_management("Payment Request", payment_requests)
+	refresh_cash_management("Payment Requester", [doc.get("custom_payment_reference_name")])
+
+
+def on_tracker_update(doc, method=None):
+	"""doc_events hook for Payment Request Tracker, including links it was moved away from."""
+	payment_requests = {doc.payment_request}
+	payment_requesters = {doc.payment_requester}
+
+	before = doc.get_doc_before_save() if method != "after_delete" else None
+	if before:
+		payment_requests.add(before.payment_request)
+		payment_requesters.add(before.payment_requester)
+
+	refresh_cash_management("Payment Request", payment_requests)
+	refresh_cash_management("Payment Requester", payment_requesters)
+
+
+def on_purchase_order_update(doc, method=None):
+	refresh_cash_management(
+		"Payment Request",
+		frappe.get_all("Cash Management", filters={"purchase_order": doc.name}, pluck="source_name"),
+	)
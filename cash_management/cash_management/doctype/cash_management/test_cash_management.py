@@ -1,9 +1,93 @@
 # Copyright (c) 2025, chris.panikulangara@finbyz.tech and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate, now
+
+from cash_management.cash_management.utils.payment_list import decode_cursor, encode_cursor, fetch_page
+
+PREFIX = "_Test CM Page "
+
+# (source_name, transaction_date), inserted out of order
+ROWS = [
+	("C", "2026-01-01"),
+	("F", None),
+	("A", "2026-01-02"),
+	("E", "2026-01-01"),
+	("G", None),
+	("B", "2026-01-02"),
+	("D", "2026-01-01"),
+]
+
+# transaction_date DESC, source_name DESC, NULL dates last
+EXPECTED = ["B", "A", "E", "D", "C", "G", "F"]
 
 
 class TestCashManagement(FrappeTestCase):
-	pass
+	def setUp(self):
+		timestamp = now()
+		frappe.db.bulk_insert(
+			"Cash Management",
+			["name", "creation", "modified", "owner", "modified_by", "source_doctype", "source_name", "transaction_date"],
+			[
+				[
+					frappe.generate_hash(length=10),
+					timestamp,
+					timestamp,
+					"Administrator",
+					"Administrator",
+					"Payment Request",
+					PREFIX + name,
+					transaction_date,
+				]
+				for name, transaction_date in ROWS
+			],
+		)
+
+	def tearDown(self):
+		frappe.db.delete("Cash Management", {"source_name": ("like", PREFIX + "%")})
+
+	def fetch(self, limit=None, cursor=None):
+		return fetch_page(["t.source_name LIKE %(prefix)s"], {"prefix": PREFIX + "%"}, limit, cursor)
+
+	def fetch_all_pages(self, limit):
+		pages = []
+		cursor = None
+		while True:
+			page = self.fetch(limit, cursor)
+			pages.append([row.source_name.removeprefix(PREFIX) for row in page["rows"]])
+			cursor = page["next_cursor"]
+			if not cursor:
+				return pages
+
+	def test_cursor_round_trip(self):
+		for transaction_date in (getdate("2026-01-01"), None):
+			cursor = encode_cursor({"transaction_date": transaction_date, "source_name": "ACC-PRQ-0001"})
+			self.assertEqual(decode_cursor(cursor), (transaction_date, "ACC-PRQ-0001"))
+
+	def test_invalid_cursor_is_rejected(self):
+		self.assertRaises(frappe.ValidationError, decode_cursor, "not a cursor")
+
+	def test_unpaged_order(self):
+		self.assertEqual([row.source_name.removeprefix(PREFIX) for row in self.fetch()["rows"]], EXPECTED)
+
+	def test_pages_do_not_overlap_or_skip_on_tied_dates(self):
+		for limit in (1, 2, 3, 4):
+			pages = self.fetch_all_pages(limit)
+			self.assertEqual([name for page in pages for name in page], EXPECTED, f"limit {limit}")
+			self.assertTrue(all(len(page) <= limit for page in pages))
+
+	def test_paging_moves_into_null_dates(self):
+		# the second page starts dated and ends in the NULL-dated rows, the third only has those
+		self.assertEqual(self.fetch_all_pages(3), [["B", "A", "E"], ["D", "C", "G"], ["F"]])
+		# a cursor on a NULL-dated row only continues with NULL-dated rows
+		self.assertEqual(self.fetch_all_pages(6)[-1], ["F"])
+
+	def test_total_count_only_on_first_page(self):
+		first = self.fetch(2)
+		self.assertEqual(first["total_count"], len(ROWS))
+
+		second = self.fetch(2, first["next_cursor"])
+		self.assertIsNone(second["total_count"])
+		self.assertIsNotNone(second["next_cursor"])
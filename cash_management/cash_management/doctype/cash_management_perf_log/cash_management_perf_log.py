@@ -0,0 +1,15 @@
+# Copyright (c) 2026, chris.panikulangara@finbyz.tech and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder import Interval
+from frappe.query_builder.functions import Now
+
+
+class CashManagementPerfLog(Document):
+	@staticmethod
+	def clear_old_logs(days=30):
+		"""Called by Log Settings, see `default_log_clearing_doctypes` in hooks."""
+		table = frappe.qb.DocType("Cash Management Perf Log")
+		frappe.db.delete(table, filters=(table.creation < (Now() - Interval(days=days))))
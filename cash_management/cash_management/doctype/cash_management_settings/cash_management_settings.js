@@ -0,0 +1,15 @@
+// Copyright (c) 2026, chris.panikulangara@finbyz.tech and contributors
+// For license information, please see license.txt
+
+frappe.ui.form.on("Cash Management Settings", {
+	refresh(frm) {
+		frm.add_custom_button(__("Full Tracker Reconcile"), () => {
+			frappe.confirm(__("Recompute every Payment Request Tracker, ignoring the sync watermarks?"), () => {
+				frappe.call({
+					method: "cash_management.cash_management.doctype.payment_request_tracker.payment_request_tracker.enqueue_reconcile_payment_trackers",
+					callback: () => frappe.show_alert({ message: __("Reconcile queued"), indicator: "blue" }),
+				});
+			});
+		});
+	},
+});
@@ -0,0 +1,164 @@
+# Copyright (c) 2026, chris.panikulangara@finbyz.tech and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import flt, now
+
+# One row per referenced document (Purchase Order, ...) holding its grand total and the
+# paid_amount of every submitted Payment Entry referencing it, so list pages can read
+# "PO remaining" without joining Payment Entry / Payment Entry Reference per row.
+# Rows are recomputed by the Payment Entry and Purchase Order doc_events in hooks.py.
+
+
+class PaymentReferenceRollup(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_unique(
+		"Payment Reference Rollup",
+		["reference_doctype", "reference_name"],
+		constraint_name="unique_reference",
+	)
+
+
+def get_reference_rollups(reference_doctype, names):
+	"""Return {reference_name: {grand_total, total_paid, outstanding}}, building missing rows."""
+	names = {name for name in names if name}
+	if not names:
+		return {}
+
+	rollups = {
+		row.reference_name: row
+		for row in frappe.get_all(
+			"Payment Reference Rollup",
+			filters={"reference_doctype": reference_doctype, "reference_name": ["in", list(names)]},
+			fields=["reference_name", "grand_total", "total_paid", "outstanding"],
+		)
+	}
+
+	missing = names - set(rollups)
+	if missing:
+		rollups.update(update_reference_rollups(reference_doctype, missing))
+
+	return rollups
+
+
+def update_reference_rollups(reference_doctype, names):
+	"""Recompute and upsert the rollups of the given references, returning the new values."""
+	names = {name for name in names if name}
+	if not names:
+		return {}
+
+	grand_totals = get_grand_totals(reference_doctype, names)
+	paid_totals = dict(
+		frappe.db.sql(
+			"""
+			SELECT per.reference_name, COALESCE(SUM(pe.paid_amount), 0)
+			FROM `tabPayment Entry` pe
+			INNER JOIN `tabPayment Entry Reference` per
+			ON per.parent = pe.name
+			WHERE pe.docstatus = 1
+			AND per.reference_doctype = %(reference_doctype)s
+			AND per.reference_name IN %(names)s
+			GROUP BY per.reference_name
+			""",
+			{"reference_doctype": reference_doctype, "names": tuple(names)},
+		)
+	)
+
+	rollups = {}
+	for name in names:
+		grand_total = flt(grand_totals.get(name))
+		total_paid = flt(paid_totals.get(name))
+		rollups[name] = frappe._dict(
+			reference_name=name,
+			grand_total=grand_total,
+			total_paid=total_paid,
+			outstanding=max(0.0, grand_total - total_paid),
+		)
+
+	upsert_rollups(reference_doctype, rollups.values())
+	return rollups
+
+
+def get_grand_totals(reference_doctype, names):
+	try:
+		if not frappe.get_meta(reference_doctype).has_field("grand_total"):
+			return {}
+	except frappe.DoesNotExistError:
+		return {}
+
+	return dict(
+		frappe.get_all(
+			reference_doctype,
+			filters={"name": ["in", list(names)]},
+			fields=["name", "grand_total"],
+			as_list=True,
+		)
+	)
+
+
+def upsert_rollups(reference_doctype, rollups):
+	timestamp = now()
+	user = frappe.session.user
+	for rollup in rollups:
+		frappe.db.sql(
+			"""
+			INSERT INTO `tabPayment Reference Rollup`
+				(name, creation, modified, owner, modified_by, docstatus,
+				reference_doctype, reference_name, grand_total, total_paid, outstanding)
+			VALUES
+				(%(name)s, %(timestamp)s, %(timestamp)s, %(user)s, %(user)s, 0,
+				%(reference_doctype)s, %(reference_name)s, %(grand_total)s, %(total_paid)s, %(outstanding)s)
+			ON DUPLICATE KEY UPDATE
+				modified = VALUES(modified),
+				modified_by = VALUES(modified_by),
+				grand_total = VALUES(grand_total),
+				total_paid = VALUES(total_paid),
+				outstanding = VALUES(outstanding)
+			""",
+			{
+				"name": frappe.generate_hash(length=10),
+				"timestamp": timestamp,
+				"user": user,
+				"reference_doctype": reference_doctype,
+				**rollup,
+			},
+		)
+
+
+def rebuild_reference_rollups(reference_doctype="Purchase Order", chunk_size=1000):
+	"""Backfill rollups for every document referenced by a Payment Entry."""
+	names = frappe.db.sql_list(
+		"""
+		SELECT DISTINCT reference_name
+		FROM `tabPayment Entry Reference`
+		WHERE reference_doctype = %s
+		""",
+		(reference_doctype,),
+	)
+	for start in range(0, len(names), chunk_size):
+		update_reference_rollups(reference_doctype, names[start : start + chunk_size])
+		frappe.db.commit()
+
+
+def on_payment_entry_update(doc, method=None):
+	"""doc_events hook for Payment Entry submit / cancel."""
+	references = {}
+	for ref in doc.get("references") or []:
+		if ref.reference_doctype and ref.reference_name:
+			references.setdefault(ref.reference_doctype, set()).add(ref.reference_name)
+
+	for reference_doctype, names in references.items():
+		update_reference_rollups(reference_doctype, names)
+
+
+def on_reference_update(doc, method=None):
+	"""doc_events hook for referenced documents whose grand total can change."""
+	update_reference_rollups(doc.doctype, [doc.name])
+
+
+def on_reference_trash(doc, method=None):
+	frappe.db.delete("Payment Reference Rollup", {"reference_doctype": doc.doctype, "reference_name": doc.name})
@@ -4,8 +4,14 @@
 # import frappe
 from frappe.model.document import Document
 import frappe
+import redis
+from frappe.utils import cint, flt, now, now_datetime
 from erpnext.accounts.doctype.payment_request.payment_request import make_payment_entry
 
+from cash_management.cash_management.doctype.cash_management.cash_management import refresh_cash_management
+from cash_management.cash_management.utils.perf_log import log_performance
+from cash_management.cash_management.utils.report_cache import clear_requester_report_cache
+
 class PaymentRequestTracker(Document):
     def before_save(self):
         total_paid = self.total_amount_paid or 0
@@ -22,96 +28,334 @@ class PaymentRequestTracker(Document):
             else:
                 row.paid = 0
 
-def sync_payment_request_trackers():
-    payment_requests = frappe.get_all("Payment Request", fields=["name", "grand_total"])
 
-    for pr in payment_requests:
-        # Check if a Tracker exists
-        tracker_name = frappe.db.exists("Payment Request Tracker", {"payment_request": pr.name})
+def on_doctype_update():
+    # one tracker per source, so concurrent syncs cannot insert the same tracker twice
+    frappe.db.add_unique("Payment Request Tracker", ["payment_request"], constraint_name="unique_payment_request")
+    frappe.db.add_unique(
+        "Payment Request Tracker", ["payment_requester"], constraint_name="unique_payment_requester"
+    )
 
-        # Get Payment Entry linked to this Payment Request (via reference_no)
-        payment_entry = frappe.db.get_value(
-            "Payment Entry",
-            {"reference_no": pr.name},
-            "name"
-        )
+# How each source doctype is linked to its tracker and to its Payment Entries
+SYNC_SOURCES = {
+    "Payment Request": {
+        "tracker_field": "payment_request",
+        "payment_entry_field": "reference_no",
+        "watermark_field": "payment_request_sync_watermark",
+    },
+    "Payment Requester": {
+        "tracker_field": "payment_requester",
+        "payment_entry_field": "custom_payment_reference_name",
+        "watermark_field": "payment_requester_sync_watermark",
+    },
+}
+
+
+@log_performance
+def sync_payment_request_trackers(full=False):
+    sync_trackers("Payment Request", full=full)
+
+
+@log_performance
+def sync_payment_requester_trackers(full=False):
+    sync_trackers("Payment Requester", full=full)
+
+
+def reconcile_payment_trackers():
+    """Full reconcile of every tracker, ignoring the sync watermarks."""
+    for source_doctype in SYNC_SOURCES:
+        sync_trackers(source_doctype, full=True)
+
+
+@frappe.whitelist()
+def enqueue_reconcile_payment_trackers():
+    frappe.only_for("System Manager")
+    frappe.enqueue(
+        reconcile_payment_trackers,
+        queue="long",
+        timeout=3600 * 4,
+        job_id="cash_management::reconcile_payment_trackers",
+        deduplicate=True,
+    )
+
+
+PENDING_SYNC_KEY = "cash_management:pending_tracker_sync:{0}"
+
+
+def on_payment_entry_change(doc, method=None):
+    """doc_events hook for Payment Entry: queue the trackers of the requests it pays."""
+    payment_requests = {doc.get("reference_no")}
+    for ref in doc.get("references") or []:
+        if ref.reference_doctype == "Payment Request":
+            payment_requests.add(ref.reference_name)
+        payment_requests.add(ref.get("payment_request"))
+
+    queue_tracker_sync("Payment Request", payment_requests)
+    queue_tracker_sync("Payment Requester", [doc.get("custom_payment_reference_name")])
+
+
+def on_source_change(doc, method=None):
+    """doc_events hook for Payment Request / Payment Requester."""
+    queue_tracker_sync(doc.doctype, [doc.name])
+
+
+def queue_tracker_sync(source_doctype, names):
+    """
+    Mark the trackers of `names` for recompute and make sure a flush job is queued.
+
+    Names collect in a Redis set and the flush job is deduplicated, so a burst of
+    Payment Entries for the same request results in one recompute.
+    """
+    names = {name for name in names if name}
+    if not names:
+        return
+
+    try:
+        frappe.cache.sadd(PENDING_SYNC_KEY.format(source_doctype), *names)
+    except Exception:
+        # no Redis, recompute right away
+        sync_tracker_chunk(source_doctype, list(names))
+        return
 
-        if tracker_name:
-            # Update existing tracker
-            tracker = frappe.get_doc("Payment Request Tracker", tracker_name)
+    frappe.enqueue(
+        flush_pending_tracker_syncs,
+        queue="short",
+        job_id="cash_management::flush_pending_tracker_syncs",
+        deduplicate=True,
+        enqueue_after_commit=True,
+    )
 
-            # Recalculate totals
-            total_paid = 0
-            if payment_entry:
-                total_paid = frappe.db.get_value("Payment Entry", payment_entry, "paid_amount") or 0
 
-            total_remaining = (pr.grand_total or 0) - total_paid
+def flush_pending_tracker_syncs():
+    """Background job: recompute every tracker queued by `queue_tracker_sync`."""
+    batch_size = get_sync_batch_size()
 
-            tracker.total_amount_paid = total_paid
-            tracker.total_amount_remaining = total_remaining
-            tracker.payment_entry = payment_entry
-            tracker.save(ignore_permissions=True)
+    # names queued while this job runs do not enqueue it again (it is deduplicated), so keep
+    # going until a whole round over the sources finds every pending set empty
+    flushed = True
+    while flushed:
+        flushed = False
+        for source_doctype in SYNC_SOURCES:
+            while names := pop_pending(source_doctype, batch_size):
+                sync_tracker_chunk(source_doctype, names)
+                frappe.db.commit()
+                flushed = True
 
-        else:
-            # Create new tracker
-            total_paid = 0
-            if payment_entry:
-                total_paid = frappe.db.get_value("Payment Entry", payment_entry, "paid_amount") or 0
 
-            total_remaining = (pr.grand_total or 0) - total_paid
+def pop_pending(source_doctype, count):
+    # RedisWrapper.spop neither takes a count nor expects a prefixed key, use the raw client
+    key = frappe.cache.make_key(PENDING_SYNC_KEY.format(source_doctype))
+    names = redis.Redis.spop(frappe.cache, key, count) or []
+    return [name.decode() if isinstance(name, bytes) else name for name in names]
 
-            tracker = frappe.new_doc("Payment Request Tracker")
-            tracker.payment_request = pr.name
-            tracker.total_amount_paid = total_paid
-            tracker.total_amount_remaining = total_remaining
-            tracker.payment_entry = payment_entry
-            tracker.insert(ignore_permissions=True)
 
+def sync_trackers(source_doctype, full=False, batch_size=None):
+    """
+    Create / update the trackers of `source_doctype` documents.
+
+    Only documents modified since the last run, or referenced by a Payment Entry modified
+    since then, are processed unless `full` is set (see `get_sync_names`). Work is done in
+    set-based chunks of `batch_size` (Cash Management Settings) names, committed per chunk.
+    """
+    started, names = get_sync_names(source_doctype, full=full)
+    batch_size = get_sync_batch_size(batch_size)
+
+    for start in range(0, len(names), batch_size):
+        sync_tracker_chunk(source_doctype, names[start : start + batch_size])
+        frappe.db.commit()
+
+    advance_sync_watermark(source_doctype, started)
+
+
+def get_sync_names(source_doctype, full=False):
+    """
+    Start time of the run and names of the `source_doctype` documents due for sync.
+
+    Without `full` only documents changed since the watermark are returned. The start time
+    becomes the next watermark, so changes made while the run goes on are picked up again.
+    """
+    started = now_datetime()
+    watermark = None if full else frappe.db.get_single_value(
+        "Cash Management Settings", SYNC_SOURCES[source_doctype]["watermark_field"]
+    )
+
+    if watermark:
+        names = get_changed_sources(source_doctype, watermark)
+    else:
+        names = frappe.get_all(source_doctype, pluck="name", order_by="name")
+
+    return started, names
+
+
+def advance_sync_watermark(source_doctype, started):
+    """Record a completed run of `source_doctype` that started at `started`."""
+    frappe.db.set_single_value("Cash Management Settings", SYNC_SOURCES[source_doctype]["watermark_field"], started)
     frappe.db.commit()
 
-def sync_payment_requester_trackers():
-    payment_requests = frappe.get_all("Payment Requester", fields=["name", "grand_total"])
 
-    for pr in payment_requests:
-        # Check if a Tracker exists
-        tracker_name = frappe.db.exists("Payment Request Tracker", {"payment_requester": pr.name})
+def get_sync_batch_size(batch_size=None):
+    return cint(batch_size or frappe.db.get_single_value("Cash Management Settings", "sync_batch_size")) or 1000
+
+
+def get_changed_sources(source_doctype, watermark):
+    """Names of `source_doctype` documents modified, or paid against, since `watermark`."""
+    payment_entry_field = SYNC_SOURCES[source_doctype]["payment_entry_field"]
+    return frappe.db.sql_list(
+        f"""
+        SELECT name FROM `tab{source_doctype}` WHERE modified >= %(watermark)s
+        UNION
+        SELECT src.name
+        FROM `tabPayment Entry` pe
+        INNER JOIN `tab{source_doctype}` src
+        ON src.name = pe.`{payment_entry_field}`
+        WHERE pe.modified >= %(watermark)s
+        """,
+        {"watermark": watermark},
+    )
+
+
+def get_payment_totals_query(source):
+    """
+    Derived table of (source_name, total_paid, payment_count, payment_entry) for the
+    sources in %(names)s: one GROUP BY over their submitted Payment Entries, with the
+    latest entry by posting date.
+    """
+    field = source["payment_entry_field"]
+    return f"""
+        SELECT
+            pe.`{field}` AS source_name,
+            SUM(IFNULL(pe.paid_amount, 0)) AS total_paid,
+            COUNT(*) AS payment_count,
+            SUBSTRING_INDEX(
+                GROUP_CONCAT(pe.name ORDER BY pe.posting_date DESC, pe.creation DESC SEPARATOR '\\n'), '\\n', 1
+            ) AS payment_entry
+        FROM `tabPayment Entry` pe
+        WHERE pe.docstatus = 1
+        AND pe.`{field}` IN %(names)s
+        GROUP BY pe.`{field}`
+    """
 
-        # Get Payment Entry linked to this Payment Request (via reference_no)
-        payment_entry = frappe.db.get_value(
-            "Payment Entry",
-            {"custom_payment_reference_name": pr.name},
-            "name"
-        )
 
-        if tracker_name:
-            # Update existing tracker
-            tracker = frappe.get_doc("Payment Request Tracker", tracker_name)
+def get_payment_totals(source_doctype, names):
+    """{source_name: {total_paid, payment_count, payment_entry}} for `names`, in one query."""
+    if not names:
+        return {}
+    rows = frappe.db.sql(
+        get_payment_totals_query(SYNC_SOURCES[source_doctype]), {"names": tuple(names)}, as_dict=True
+    )
+    return {row.pop("source_name"): row for row in rows}
 
-            # Recalculate totals
-            total_paid = 0
-            if payment_entry:
-                total_paid = frappe.db.get_value("Payment Entry", payment_entry, "paid_amount") or 0
 
-            total_remaining = (pr.grand_total or 0) - total_paid
+def sync_tracker_chunk(source_doctype, names):
+    """
+    Insert missing and update existing trackers of `names` with set-based queries.
 
-            tracker.total_amount_paid = total_paid
-            tracker.total_amount_remaining = total_remaining
-            tracker.payment_entry = payment_entry
-            tracker.save(ignore_permissions=True)
+    Sharded chunks, the flush job and the full reconcile can run at the same time; a
+    tracker inserted by one of them in the meantime is skipped through the unique index.
+    """
+    if not names:
+        return
 
-        else:
-            # Create new tracker
-            total_paid = 0
-            if payment_entry:
-                total_paid = frappe.db.get_value("Payment Entry", payment_entry, "paid_amount") or 0
+    source = SYNC_SOURCES[source_doctype]
+    tracker_field = source["tracker_field"]
+    totals_query = get_payment_totals_query(source)
+    values = {"names": tuple(names), "modified": now(), "user": frappe.session.user}
 
-            total_remaining = (pr.grand_total or 0) - total_paid
+    missing = frappe.db.sql(
+        f"""
+        SELECT src.name, IFNULL(src.grand_total, 0) AS grand_total
+        FROM `tab{source_doctype}` src
+        WHERE src.name IN %(names)s
+        AND NOT EXISTS (
+            SELECT 1 FROM `tabPayment Request Tracker` trk WHERE trk.`{tracker_field}` = src.name
+        )
+        """,
+        values,
+        as_dict=True,
+    )
+    if missing:
+        totals = get_payment_totals(source_doctype, [row.name for row in missing])
+        rows = []
+        for row in missing:
+            paid = totals.get(row.name) or frappe._dict(total_paid=0, payment_entry=None)
+            rows.append(
+                [
+                    frappe.generate_hash(length=10),
+                    values["modified"],
+                    values["modified"],
+                    values["user"],
+                    values["user"],
+                    0,
+                    row.name,
+                    flt(paid.total_paid),
+                    flt(row.grand_total) - flt(paid.total_paid),
+                    paid.payment_entry,
+                ]
+            )
+
+        frappe.db.bulk_insert(
+            "Payment Request Tracker",
+            [
+                "name",
+                "creation",
+                "modified",
+                "owner",
+                "modified_by",
+                "docstatus",
+                tracker_field,
+                "total_amount_paid",
+                "total_amount_remaining",
+                "payment_entry",
+            ],
+            rows,
+            ignore_duplicates=True,
+        )
+
+    frappe.db.sql(
+        f"""
+        UPDATE `tabPayment Request Tracker` trk
+        INNER JOIN `tab{source_doctype}` src
+        ON src.name = trk.`{tracker_field}`
+        LEFT JOIN ({totals_query}) totals
+        ON totals.source_name = src.name
+        SET
+            trk.total_amount_paid = IFNULL(totals.total_paid, 0),
+            trk.total_amount_remaining = IFNULL(src.grand_total, 0) - IFNULL(totals.total_paid, 0),
+            trk.payment_entry = totals.payment_entry,
+            trk.modified = %(modified)s,
+            trk.modified_by = %(user)s
+        WHERE src.name IN %(names)s
+        AND NOT (
+            trk.total_amount_paid <=> IFNULL(totals.total_paid, 0)
+            AND trk.total_amount_remaining <=> IFNULL(src.grand_total, 0) - IFNULL(totals.total_paid, 0)
+            AND trk.payment_entry <=> totals.payment_entry
+        )
+        """,
+        values,
+    )
 
-            tracker = frappe.new_doc("Payment Request Tracker")
-            tracker.payment_requester = pr.name
-            tracker.total_amount_paid = total_paid
-            tracker.total_amount_remaining = total_remaining
-            tracker.payment_entry = payment_entry
-            tracker.insert(ignore_permissions=True)
+    # what PaymentRequestTracker.before_save does for the child rows
+    frappe.db.sql(
+        f"""
+        UPDATE `tabPayment Request Details` d
+        INNER JOIN `tabPayment Request Tracker` trk
+        ON trk.name = d.parent AND d.parenttype = 'Payment Request Tracker'
+        SET
+            d.grand_total = IFNULL(trk.total_amount_paid, 0) + IFNULL(trk.total_amount_remaining, 0),
+            d.unpaid_amount = IFNULL(trk.total_amount_paid, 0) + IFNULL(trk.total_amount_remaining, 0)
+                - IFNULL(d.paid_amount, 0),
+            d.paid = CASE
+                WHEN IFNULL(trk.total_amount_paid, 0) + IFNULL(trk.total_amount_remaining, 0) > 0
+                THEN IFNULL(d.paid_amount, 0) * 100
+                    / (IFNULL(trk.total_amount_paid, 0) + IFNULL(trk.total_amount_remaining, 0))
+                ELSE 0
+            END
+        WHERE trk.`{tracker_field}` IN %(names)s
+        """,
+        values,
+    )
 
-    frappe.db.commit()
\ No newline at end of file
+    # trackers were written without doc_events, bring the read model along
+    refresh_cash_management(source_doctype, names)
+    if source_doctype == "Payment Requester":
+        clear_requester_report_cache()
@@ -1,9 +1,206 @@
 # Copyright (c) 2025, chris.panikulangara@finbyz.tech and Contributors
 # See license.txt
 
-# import frappe
+from unittest.mock import MagicMock, patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import now
+
+from cash_management.cash_management.doctype.payment_request_tracker.payment_request_tracker import (
+	PENDING_SYNC_KEY,
+	SYNC_SOURCES,
+	PaymentRequestTracker,
+	flush_pending_tracker_syncs,
+	pop_pending,
+	queue_tracker_sync,
+)
+from cash_management.cash_management.utils.tracker_posting import update_tracker_child_table
+
+TRACKER_POSTING = "cash_management.cash_management.utils.tracker_posting"
+SUBMITTED_PAYMENT_ENTRY = "_Test CM Submitted PE"
 
 
 class TestPaymentRequestTracker(FrappeTestCase):
-	pass
+	def tearDown(self):
+		for source_doctype in SYNC_SOURCES:
+			frappe.cache.delete_value(PENDING_SYNC_KEY.format(source_doctype))
+
+	def test_pop_pending_returns_queued_names_once(self):
+		queue_tracker_sync("Payment Request", ["_Test PR 1", "_Test PR 2", None])
+
+		self.assertEqual(sorted(pop_pending("Payment Request", 10)), ["_Test PR 1", "_Test PR 2"])
+		self.assertEqual(pop_pending("Payment Request", 10), [])
+
+	def test_pop_pending_takes_at_most_count(self):
+		queue_tracker_sync("Payment Requester", ["_Test PRQ 1", "_Test PRQ 2", "_Test PRQ 3"])
+
+		self.assertEqual(len(pop_pending("Payment Requester", 2)), 2)
+		self.assertEqual(len(pop_pending("Payment Requester", 2)), 1)
+
+	def test_flush_pending_tracker_syncs_empties_the_queue(self):
+		queue_tracker_sync("Payment Request", ["_Test PR 1"])
+		queue_tracker_sync("Payment Requester", ["_Test PRQ 1"])
+
+		flush_pending_tracker_syncs()
+
+		for source_doctype in SYNC_SOURCES:
+			self.assertEqual(pop_pending(source_doctype, 10), [])
+
+	def test_flush_picks_up_names_queued_after_their_source_was_drained(self):
+		synced = []
+
+		def sync_tracker_chunk(source_doctype, names):
+			synced.append((source_doctype, sorted(names)))
+			if source_doctype == "Payment Requester" and len(synced) == 2:
+				# queued while the job runs, after the Payment Request set was emptied
+				queue_tracker_sync("Payment Request", ["_Test PR 2"])
+
+		queue_tracker_sync("Payment Request", ["_Test PR 1"])
+		queue_tracker_sync("Payment Requester", ["_Test PRQ 1"])
+
+		with patch(
+			"cash_management.cash_management.doctype.payment_request_tracker.payment_request_tracker.sync_tracker_chunk",
+			side_effect=sync_tracker_chunk,
+		):
+			flush_pending_tracker_syncs()
+
+		self.assertEqual(
+			synced,
+			[
+				("Payment Request", ["_Test PR 1"]),
+				("Payment Requester", ["_Test PRQ 1"]),
+				("Payment Request", ["_Test PR 2"]),
+			],
+		)
+		self.assertEqual(pop_pending("Payment Request", 10), [])
+
+
+	def test_second_tracker_for_the_same_source_is_skipped(self):
+		timestamp = now()
+		for _attempt in range(2):
+			frappe.db.bulk_insert(
+				"Payment Request Tracker",
+				["name", "creation", "modified", "owner", "modified_by", "docstatus", "payment_request"],
+				[[frappe.generate_hash(length=10), timestamp, timestamp, "Administrator", "Administrator", 0, "_Test PR 1"]],
+				ignore_duplicates=True,
+			)
+
+		self.assertEqual(frappe.db.count("Payment Request Tracker", {"payment_request": "_Test PR 1"}), 1)
+
+
+class TestTrackerPosting(FrappeTestCase):
+	def setUp(self):
+		# everything stays in the test transaction, which FrappeTestCase rolls back
+		self.start_patch(frappe.db, "commit")
+		# neither the Payment Request nor the Payment Entries the rows link to exist
+		self.start_patch(PaymentRequestTracker, "_validate_links")
+		self.start_patch(
+			f"{TRACKER_POSTING}.get_payment_entry_docstatus", return_value={SUBMITTED_PAYMENT_ENTRY: 1}
+		)
+		self.created = []
+		self.make_payment_entry = self.start_patch(
+			f"{TRACKER_POSTING}.make_payment_entry", side_effect=self.mock_payment_entry
+		)
+
+	def start_patch(self, target, attribute=None, **kwargs):
+		patcher = patch.object(target, attribute, **kwargs) if attribute else patch(target, **kwargs)
+		self.addCleanup(patcher.stop)
+		return patcher.start()
+
+	def mock_payment_entry(self, payment_request):
+		pe_doc = MagicMock(references=[])
+
+		def insert(**kwargs):
+			pe_doc.name = f"_Test CM PE {len(self.created) + 1}"
+			self.created.append(pe_doc.name)
+			return pe_doc
+
+		pe_doc.insert.side_effect = insert
+		return pe_doc
+
+	def make_tracker(self, rows=None):
+		return frappe.get_doc(
+			{
+				"doctype": "Payment Request Tracker",
+				"payment_request": f"_Test CM PR {frappe.generate_hash(length=6)}",
+				"total_amount_paid": 0,
+				"total_amount_remaining": 1000,
+				"payment_request_details": rows or [],
+			}
+		).insert(ignore_permissions=True)
+
+	def dialog_rows(self, tracker):
+		tracker.reload()
+		return [
+			{
+				"row_key": row.row_key,
+				"transaction_date": str(row.transaction_date),
+				"paid": row.paid,
+				"paid_amount": row.paid_amount,
+			}
+			for row in tracker.payment_request_details
+		]
+
+	def test_saving_again_without_changes_posts_nothing(self):
+		tracker = self.make_tracker()
+
+		first = update_tracker_child_table(
+			tracker.name, [{"transaction_date": "2026-01-01", "paid_amount": 100}], {}
+		)
+		self.assertEqual(first["posted"], 1)
+		self.assertEqual(self.created, ["_Test CM PE 1"])
+
+		rows = self.dialog_rows(tracker)
+		self.assertTrue(rows[0]["row_key"])
+		second = update_tracker_child_table(tracker.name, rows, {})
+		self.assertEqual(second["posted"], 0)
+		self.assertEqual(self.created, ["_Test CM PE 1"])
+
+		tracker.reload()
+		self.assertEqual(len(tracker.payment_request_details), 1)
+		self.assertEqual(tracker.payment_request_details[0].payment_entry, "_Test CM PE 1")
+
+	def test_row_without_payment_request_is_not_counted(self):
+		tracker = self.make_tracker()
+		tracker.db_set("payment_request", None)
+
+		result = update_tracker_child_table(
+			tracker.name, [{"transaction_date": "2026-01-01", "paid_amount": 100}], {}
+		)
+		self.assertEqual(result["posted"], 0)
+		self.make_payment_entry.assert_not_called()
+
+	def test_unchanged_row_with_submitted_entry_is_left_alone(self):
+		tracker = self.make_submitted_tracker()
+		result = update_tracker_child_table(tracker.name, self.dialog_rows(tracker), {})
+		self.assertEqual(result["posted"], 0)
+
+	def test_editing_row_with_submitted_entry_raises(self):
+		tracker = self.make_submitted_tracker()
+		rows = self.dialog_rows(tracker)
+		rows[0]["paid_amount"] = 250
+
+		self.assertRaises(frappe.ValidationError, update_tracker_child_table, tracker.name, rows, {})
+		tracker.reload()
+		self.assertEqual(tracker.payment_request_details[0].paid_amount, 100)
+		self.make_payment_entry.assert_not_called()
+
+	def test_removing_row_with_submitted_entry_raises(self):
+		tracker = self.make_submitted_tracker()
+
+		self.assertRaises(frappe.ValidationError, update_tracker_child_table, tracker.name, [], {})
+		tracker.reload()
+		self.assertEqual(len(tracker.payment_request_details), 1)
+
+	def make_submitted_tracker(self):
+		return self.make_tracker(
+			[
+				{
+					"row_key": frappe.generate_hash(length=12),
+					"transaction_date": "2026-01-01",
+					"paid_amount": 100,
+					"payment_entry": SUBMITTED_PAYMENT_ENTRY,
+				}
+			]
+		)
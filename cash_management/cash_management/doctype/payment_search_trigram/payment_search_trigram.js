@@ -0,0 +1,8 @@
+// Copyright (c) 2026, chris.panikulangara@finbyz.tech and contributors
+// For license information, please see license.txt
+
+// frappe.ui.form.on("Payment Search Trigram", {
+// 	refresh(frm) {
+
+// 	},
+// });
@@ -0,0 +1,240 @@
+# Copyright (c) 2026, chris.panikulangara@finbyz.tech and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import cint, now
+
+# Trigram index over the names and reference names of Payment Requests and Payment
+# Requesters, so "contains" searches from the Payment Management pages resolve to a set of
+# candidate documents without a LIKE '%term%' scan. Each indexed value is stored once per
+# distinct lower-cased trigram; a search counts the rows of each trigram of the term
+# (capped), takes the values holding the rarest one and checks the substring on them.
+# Rows are maintained by the doc_events in hooks.py and backfilled with
+# `rebuild_search_trigrams`.
+
+SOURCE_DOCTYPES = ("Payment Request", "Payment Requester")
+INDEXED_FIELDS = ("name", "reference_name")
+TRIGRAM_FIELDS = ["source_doctype", "source_name", "field", "value", "trigram"]
+
+# beyond this even the rarest trigram of a term is too unselective to beat a scan
+MAX_CANDIDATES = 5000
+
+
+class PaymentSearchTrigram(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Payment Search Trigram", ["trigram", "source_doctype", "field", "source_name"])
+	frappe.db.add_index("Payment Search Trigram", ["source_doctype", "source_name"])
+
+
+def get_trigrams(value):
+	value = (value or "").lower()
+	return {value[i : i + 3] for i in range(len(value) - 2)}
+
+
+def search_source_names(source_doctype, field, term):
+	"""
+	Names of `source_doctype` documents whose `field` contains `term` (case-insensitive).
+
+	Returns None when the index cannot answer selectively (terms shorter than three
+	characters or too many candidates); callers then fall back to a LIKE condition.
+	"""
+	return search(source_doctype, field, term, "source_name")
+
+
+def search_values(source_doctype, field, term, limit=20):
+	"""Distinct indexed values of `field` containing `term`, for autocomplete."""
+	values = search(source_doctype, field, term, "value", limit=limit)
+	if values is None:
+		# too short for trigrams, a prefix match can still use the B-tree index
+		values = frappe.get_all(
+			source_doctype,
+			filters={field: ["like", f"{(term or '').strip()}%"]},
+			pluck=field,
+			distinct=True,
+			limit=limit,
+		)
+	return sorted(value for value in values if value)[:limit]
+
+
+def search(source_doctype, field, term, column, limit=None):
+	term = (term or "").strip().lower()
+	trigrams = get_trigrams(term)
+	if not trigrams:
+		return None
+
+	values = {"source_doctype": source_doctype, "field": field, "max_rows": MAX_CANDIDATES + 1}
+	counts = get_trigram_counts(trigrams, values)
+	rarest = min(sorted(trigrams), key=lambda trigram: counts.get(trigram, 0))
+	if not counts.get(rarest):
+		return set()
+	if counts[rarest] > MAX_CANDIDATES and not limit:
+		return None
+
+	# every candidate holds the rarest trigram, the substring check on its value decides
+	rows = frappe.db.sql(
+		"""
+		SELECT source_name, value
+		FROM `tabPayment Search Trigram`
+		WHERE trigram = %(trigram)s
+		AND source_doctype = %(source_doctype)s
+		AND field = %(field)s
+		LIMIT %(max_rows)s
+		""",
+		{**values, "trigram": rarest},
+		as_dict=True,
+	)
+	return {row[column] for row in rows if term in row.value.lower()}
+
+
+def get_trigram_counts(trigrams, values):
+	"""
+	{trigram: rows} of the index for `trigrams`, each counted up to `values["max_rows"]`.
+
+	The limit is applied per trigram, so a common trigram costs at most that many index
+	entries instead of its whole posting list.
+	"""
+	queries = []
+	params = dict(values)
+	for i, trigram in enumerate(sorted(trigrams)):
+		params[f"trigram_{i}"] = trigram
+		queries.append(
+			f"""
+			(SELECT %(trigram_{i})s AS trigram
+			FROM `tabPayment Search Trigram`
+			WHERE trigram = %(trigram_{i})s
+			AND source_doctype = %(source_doctype)s
+			AND field = %(field)s
+			LIMIT %(max_rows)s)
+			"""
+		)
+
+	return dict(
+		frappe.db.sql(
+			f"""
+			SELECT trigram, COUNT(*)
+			FROM ({" UNION ALL ".join(queries)}) postings
+			GROUP BY trigram
+			""",
+			params,
+		)
+	)
+
+
+@frappe.whitelist()
+@frappe.validate_and_sanitize_search_inputs
+def search_payment_names(doctype, txt, searchfield, start, page_len, filters):
+	"""
+	Link field search backed by the trigram index.
+
+	`filters` may hold `source_doctype` (defaults to `doctype`) and `field` ("name" or
+	"reference_name"); with `reference_doctype` only references to that doctype are kept.
+	"""
+	filters = filters or {}
+	source_doctype = filters.get("source_doctype") or doctype
+	field = filters.get("field") or "name"
+	if source_doctype not in SOURCE_DOCTYPES or field not in INDEXED_FIELDS:
+		return []
+
+	start = cint(start)
+	page_len = cint(page_len) or 20
+	values = search_values(source_doctype, field, txt, limit=start + page_len)
+
+	if field == "reference_name" and filters.get("reference_doctype") and values:
+		values = sorted(
+			frappe.get_all(
+				source_doctype,
+				filters={
+					"reference_doctype": filters.get("reference_doctype"),
+					"reference_name": ["in", values],
+				},
+				pluck="reference_name",
+				distinct=True,
+			)
+		)
+
+	return [(value,) for value in values[start : start + page_len]]
+
+
+def index_documents(source_doctype, docs):
+	"""(Re)index `docs`, rows or documents with name and reference_name."""
+	docs = [doc for doc in docs if doc.get("name")]
+	if not docs:
+		return
+
+	frappe.db.delete(
+		"Payment Search Trigram",
+		{"source_doctype": source_doctype, "source_name": ("in", [doc.get("name") for doc in docs])},
+	)
+
+	timestamp = now()
+	user = frappe.session.user
+	values = []
+	for doc in docs:
+		for field in INDEXED_FIELDS:
+			value = doc.get(field)
+			for trigram in get_trigrams(value):
+				values.append(
+					[
+						frappe.generate_hash(length=10),
+						timestamp,
+						timestamp,
+						user,
+						user,
+						0,
+						source_doctype,
+						doc.get("name"),
+						field,
+						value,
+						trigram,
+					]
+				)
+
+	frappe.db.bulk_insert(
+		"Payment Search Trigram",
+		["name", "creation", "modified", "owner", "modified_by", "docstatus", *TRIGRAM_FIELDS],
+		values,
+	)
+
+
+def rebuild_search_trigrams(chunk_size=1000):
+	frappe.db.delete("Payment Search Trigram")
+	frappe.db.commit()
+
+	for source_doctype in SOURCE_DOCTYPES:
+		last_name = ""
+		while True:
+			docs = frappe.db.sql(
+				f"""
+				SELECT name, reference_name FROM `tab{source_doctype}`
+				WHERE name > %s
+				ORDER BY name
+				LIMIT %s
+				""",
+				(last_name, chunk_size),
+				as_dict=True,
+			)
+			if not docs:
+				break
+
+			index_documents(source_doctype, docs)
+			frappe.db.commit()
+			last_name = docs[-1].name
+
+
+def on_source_update(doc, method=None):
+	"""doc_events hook for Payment Request / Payment Requester, also covers the insert."""
+	if doc.has_value_changed("reference_name"):
+		index_documents(doc.doctype, [doc])
+
+
+def on_source_rename(doc, method=None, old=None, new=None, merge=False):
+	frappe.db.delete("Payment Search Trigram", {"source_doctype": doc.doctype, "source_name": old})
+	index_documents(doc.doctype, [frappe.db.get_value(doc.doctype, new, INDEXED_FIELDS, as_dict=True)])
+
+
+def on_source_trash(doc, method=None):
+	frappe.db.delete("Payment Search Trigram", {"source_doctype": doc.doctype, "source_name": doc.name})
@@ -0,0 +1,113 @@
+# Copyright (c) 2026, chris.panikulangara@finbyz.tech and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import now
+
+from cash_management.cash_management.doctype.payment_search_trigram import payment_search_trigram
+from cash_management.cash_management.doctype.payment_search_trigram.payment_search_trigram import (
+	get_trigrams,
+	index_documents,
+	search,
+)
+from cash_management.cash_management.utils.payment_list import get_common_conditions
+
+PREFIX = "_Test TRGM "
+
+# (name, reference_name) of the Payment Requesters searched
+DOCS = [
+	(PREFIX + "ACC-PRQ-2026-00001", "PUR-ORD-2026-00010"),
+	(PREFIX + "ACC-PRQ-2026-00002", "PUR-ORD-2026-00011"),
+	(PREFIX + "ACC-PRQ-2026-00110", "SAL-ORD-2026-00001"),
+	(PREFIX + "acc-prq-2025-00003", None),
+]
+
+
+class TestPaymentSearchTrigram(FrappeTestCase):
+	def setUp(self):
+		timestamp = now()
+		frappe.db.bulk_insert(
+			"Payment Requester",
+			["name", "creation", "modified", "owner", "modified_by", "naming_series", "reference_name"],
+			[
+				[name, timestamp, timestamp, "Administrator", "Administrator", "PR-", reference_name]
+				for name, reference_name in DOCS
+			],
+		)
+		index_documents(
+			"Payment Requester",
+			frappe.get_all(
+				"Payment Requester",
+				filters={"name": ("like", PREFIX + "%")},
+				fields=["name", "reference_name"],
+			),
+		)
+
+	def tearDown(self):
+		frappe.db.delete("Payment Requester", {"name": ("like", PREFIX + "%")})
+		frappe.db.delete("Payment Search Trigram", {"source_name": ("like", PREFIX + "%")})
+
+	def test_trigrams_are_lower_cased(self):
+		self.assertEqual(get_trigrams("ABcd"), {"abc", "bcd"})
+		self.assertEqual(get_trigrams("ACC-PRQ"), get_trigrams("acc-prq"))
+
+	def test_trigrams_are_not_padded(self):
+		# only whole trigrams of the value, no leading or trailing blanks
+		self.assertEqual(get_trigrams("abc"), {"abc"})
+		self.assertEqual(get_trigrams("aaaa"), {"aaa"})
+
+	def test_short_values_have_no_trigrams(self):
+		for value in (None, "", "a", "ab"):
+			self.assertEqual(get_trigrams(value), set())
+		self.assertIsNone(search("Payment Requester", "name", "ab", "source_name"))
+
+	def test_short_terms_fall_back_to_like(self):
+		conditions, values = get_common_conditions({"payment_request": "ab"}, "Payment Request")
+		self.assertIn("t.source_name LIKE %(payment_request)s", conditions)
+		self.assertEqual(values["payment_request"], "%ab%")
+
+	def test_term_without_match_matches_nothing(self):
+		conditions, _values = get_common_conditions({"payment_request": "zzqqxx"}, "Payment Request")
+		self.assertIn("1 = 0", conditions)
+
+	def test_search_matches_like_on_the_source(self):
+		for field, term in (
+			("name", "prq-2026"),
+			("name", "ACC-PRQ"),
+			("name", "00110"),
+			("name", "2026-0000"),
+			("name", "prq-2026-00003"),
+			("reference_name", "ORD-2026-0001"),
+			("reference_name", "sal-"),
+		):
+			expected = set(
+				frappe.get_all(
+					"Payment Requester",
+					filters={"name": ("like", PREFIX + "%"), field: ("like", f"%{term}%")},
+					pluck="name",
+				)
+			)
+			found = {
+				name
+				for name in search("Payment Requester", field, term, "source_name")
+				if name.startswith(PREFIX)
+			}
+			self.assertEqual(found, expected, f"{field} contains {term!r}")
+
+	def test_too_many_candidates_fall_back(self):
+		with patch.object(payment_search_trigram, "MAX_CANDIDATES", 1):
+			self.assertIsNone(search("Payment Requester", "name", PREFIX + "ACC", "source_name"))
+
+	def test_search_starts_from_the_rarest_trigram(self):
+		# the prefix trigrams are shared by all four documents, "110" only by one
+		with patch.object(payment_search_trigram, "MAX_CANDIDATES", 3):
+			self.assertEqual(
+				search("Payment Requester", "name", PREFIX + "ACC-PRQ-2026-00110", "source_name"),
+				{PREFIX + "ACC-PRQ-2026-00110"},
+			)
+
+	def test_unindexed_trigram_matches_nothing(self):
+		self.assertEqual(search("Payment Requester", "name", PREFIX + "ACC-zzq", "source_name"), set())
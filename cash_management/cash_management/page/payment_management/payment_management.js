@@ -25,6 +25,18 @@ frappe.pages['payment-management'].on_page_load = function (wrapper) {
 	let active_tab_doctype = "Sales Order";
 	let suppressOnChange = false;
 
+	// 🔹 Paging state (keyset cursor returned by the server)
+	const PAGE_LENGTH = 100;
+	let next_cursor = null;
+	let total_count = 0;
+	let loaded_count = 0;
+	let is_loading = false;
+	let load_token = 0;
+	let load_more_observer = null;
+
+	// 🔹 Tracker dialog data prefetched for the loaded rows, keyed by tracker
+	let tracker_details = {};
+
 	// 🔹 Default filters
 	let filters = {
 		payment_request: '',
@@ -80,7 +92,18 @@ frappe.pages['payment-management'].on_page_load = function (wrapper) {
 	this.form = new frappe.ui.FieldGroup({
 		fields: [
 			{ fieldtype: 'Section Break', label: 'Filters', collapsible: 0 },
-			{ fieldtype: 'Link', label: 'Payment Request', fieldname: 'payment_request', options: 'Payment Request' },
+			{
+				fieldtype: 'Link',
+				label: 'Payment Request',
+				fieldname: 'payment_request',
+				options: 'Payment Request',
+				get_query: function () {
+					return {
+						query: 'cash_management.cash_management.doctype.payment_search_trigram.payment_search_trigram.search_payment_names',
+						filters: { source_doctype: 'Payment Request', field: 'name' }
+					};
+				}
+			},
 			{ fieldtype: 'Column Break' },
 			{ fieldtype: 'Link', label: 'Reference Doctype', fieldname: 'reference_doctype', options: 'DocType' },
 			{ fieldtype: 'Column Break' },
@@ -92,7 +115,15 @@ frappe.pages['payment-management'].on_page_load = function (wrapper) {
 				get_query: function () {
 					const selected_doctype = filters.reference_doctype;
 					if (!selected_doctype) frappe.throw(__('Please select Reference Doctype first'));
-					return { doctype: selected_doctype, filters: {} };
+					return {
+						doctype: selected_doctype,
+						query: 'cash_management.cash_management.doctype.payment_search_trigram.payment_search_trigram.search_payment_names',
+						filters: {
+							source_doctype: active_tab_doctype === "Invoice Released Memo" ? 'Payment Requester' : 'Payment Request',
+							field: 'reference_name',
+							reference_doctype: selected_doctype
+						}
+					};
 				}
 			},
 			{ fieldtype: 'Section Break' },
@@ -184,7 +215,7 @@ frappe.pages['payment-management'].on_page_load = function (wrapper) {
 		return ` (${pct.toFixed(1)}%)`;
 	}
 
-	// renderTable (unchanged)
+	// renderTable: builds the table shell with the first page of rows
 	function renderTable(data) {
 		// 🔹 Dynamic column labels based on active tab
 		// const isInvoiceMemo = active_tab_doctype === "Invoice Released Memo";
@@ -203,79 +234,7 @@ frappe.pages['payment-management'].on_page_load = function (wrapper) {
 		}
 
 
-		let rows = data.map(row => {
-			let tracker_html = "NA";
-			if (row.tracker) {
-				tracker_html = `
-					<a href="/app/payment-request-tracker/${row.tracker}">${row.tracker}</a>
-					<br>
-					<button class="btn btn-xs btn-secondary view-tracker" data-tracker="${row.tracker}" data-grand-total="${row.grand_total || 0}">
-						View Table
-					</button>
-				`;
-			}
-
-			const refLink = (row.reference_doctype && row.reference_name)
-				? `<a href="/app/${frappe.router.slug(row.reference_doctype)}/${row.reference_name}">${row.reference_name}</a>`
-				: (row.reference_name || "NA");
-
-			const supplierBlock = (() => {
-				const supplierHtml = row.supplier_id
-					? `<a href="/app/supplier/${row.supplier_id}">${row.supplier_name || row.supplier_id}</a>`
-					: (row.supplier_name || "NA");
-				const termsHtml = row.payment_terms ? `<div class="text-muted" style="font-size:12px;">Terms: ${row.payment_terms}</div>` : "";
-				return `${supplierHtml}${termsHtml}`;
-			})();
-
-			// Payment Request Remaining column
-			const remainingAmount = row.total_amount_remaining || 0;
-			const pctRemaining = row.grand_total ? (remainingAmount / row.grand_total) * 100 : 0;
-			const pctPaid = 100 - pctRemaining;
-			const remainingValue = `
-				<div style="display:flex; flex-direction:column; gap:2px;">
-					<div>${remainingAmount}${formatPct(remainingAmount, row.grand_total)}</div>
-					<div style="display:flex; width:100%; height:10px; border-radius:4px; overflow:hidden; background:#ccc;">
-						<div style="width:${pctPaid}%; background:green; height:100%;"></div>
-						<div style="width:${pctRemaining}%; background:red; height:100%;"></div>
-					</div>
-				</div>
-			`;
-
-			// Purchase Order or Invoice Released Memo Remaining column
-			let poRemainingValue = "NA";
-			if (row.po_grand_total != null) {
-				const poPaid = row.po_grand_total - (row.po_remaining || 0);
-				const poPctRemaining = row.po_grand_total ? (row.po_remaining / row.po_grand_total) * 100 : 0;
-				const poPctPaid = 100 - poPctRemaining;
-
-				poRemainingValue = `
-					<div style="display:flex; flex-direction:column; gap:2px;">
-						<div>${row.po_remaining}${formatPct(row.po_remaining, row.po_grand_total)}</div>
-						<div style="display:flex; width:100%; height:10px; border-radius:4px; overflow:hidden; background:#ccc;">
-							<div style="width:${poPctPaid}%; background:green; height:100%;"></div>
-							<div style="width:${poPctRemaining}%; background:red; height:100%;"></div>
-						</div>
-					</div>
-				`;
-			}
-
-			const budgetName = frappe.format(row.budget || 0, { fieldtype: "Currency" });
-
-			return `
-				<tr>
-					<td>${refLink}</td>
-					<td>${row.reference_doctype || "NA"}</td>
-					<td>${frappe.format(row.po_grand_total || 0, { fieldtype: "Currency" })}</td>
-					<td>${poRemainingValue}</td>
-					<td><a href="/app/payment-request/${row.payment_request}">${row.payment_request}</a></td>
-					<td>${frappe.format(row.grand_total || 0, { fieldtype: "Currency" })}</td>
-					<td>${remainingValue}</td>
-					<td>${supplierBlock}</td>
-					<td>${budgetName}</td>
-					<td>${tracker_html}</td>
-				</tr>
-			`;
-		}).join("");
+		let rows = data.map(buildRowHtml).join("");
 
 		let html = `
 			<table class="table table-bordered">
@@ -295,252 +254,469 @@ frappe.pages['payment-management'].on_page_load = function (wrapper) {
 				</thead>
 				<tbody>${rows}</tbody>
 			</table>
+			<div class="load-more-wrap text-center mb-4"></div>
 		`;
 
 		$(table_container).html(html);
+		bindTrackerDialog();
+	}
+
+	function appendRows(data) {
+		$(table_container).find("tbody").append(data.map(buildRowHtml).join(""));
+	}
+
+	function renderLoadMore() {
+		const $wrap = $(table_container).find(".load-more-wrap");
+		if (load_more_observer) {
+			load_more_observer.disconnect();
+			load_more_observer = null;
+		}
+		if (!$wrap.length) return;
+
+		const summary = `<span class="text-muted mr-3">${__("Showing {0} of {1}", [loaded_count, total_count])}</span>`;
+		if (!next_cursor) {
+			$wrap.html(summary);
+			return;
+		}
+
+		$wrap.html(`${summary}<button class="btn btn-default btn-sm load-more">${__("Load More")}</button>`);
+		$wrap.find(".load-more").on("click", () => loadMore());
+
+		// infinite scroll: fetch the next page when the footer scrolls into view
+		if (window.IntersectionObserver) {
+			load_more_observer = new IntersectionObserver(entries => {
+				if (entries.some(entry => entry.isIntersecting)) loadMore();
+			});
+			load_more_observer.observe($wrap[0]);
+		}
+	}
+
+	function buildRowHtml(row) {
+		let tracker_html = "NA";
+		if (row.tracker) {
+			tracker_html = `
+				<a href="/app/payment-request-tracker/${row.tracker}">${row.tracker}</a>
+				<br>
+				<button class="btn btn-xs btn-secondary view-tracker" data-tracker="${row.tracker}" data-grand-total="${row.grand_total || 0}">
+					View Table
+				</button>
+			`;
+		}
+
+		const refLink = (row.reference_doctype && row.reference_name)
+			? `<a href="/app/${frappe.router.slug(row.reference_doctype)}/${row.reference_name}">${row.reference_name}</a>`
+			: (row.reference_name || "NA");
+
+		const supplierBlock = (() => {
+			const supplierHtml = row.supplier_id
+				? `<a href="/app/supplier/${row.supplier_id}">${row.supplier_name || row.supplier_id}</a>`
+				: (row.supplier_name || "NA");
+			const termsHtml = row.payment_terms ? `<div class="text-muted" style="font-size:12px;">Terms: ${row.payment_terms}</div>` : "";
+			return `${supplierHtml}${termsHtml}`;
+		})();
+
+		// Payment Request Remaining column
+		const remainingAmount = row.total_amount_remaining || 0;
+		const pctRemaining = row.grand_total ? (remainingAmount / row.grand_total) * 100 : 0;
+		const pctPaid = 100 - pctRemaining;
+		const remainingValue = `
+			<div style="display:flex; flex-direction:column; gap:2px;">
+				<div>${remainingAmount}${formatPct(remainingAmount, row.grand_total)}</div>
+				<div style="display:flex; width:100%; height:10px; border-radius:4px; overflow:hidden; background:#ccc;">
+					<div style="width:${pctPaid}%; background:green; height:100%;"></div>
+					<div style="width:${pctRemaining}%; background:red; height:100%;"></div>
+				</div>
+			</div>
+		`;
+
+		// Purchase Order or Invoice Released Memo Remaining column
+		let poRemainingValue = "NA";
+		if (row.po_grand_total != null) {
+			const poPaid = row.po_grand_total - (row.po_remaining || 0);
+			const poPctRemaining = row.po_grand_total ? (row.po_remaining / row.po_grand_total) * 100 : 0;
+			const poPctPaid = 100 - poPctRemaining;
 
+			poRemainingValue = `
+				<div style="display:flex; flex-direction:column; gap:2px;">
+					<div>${row.po_remaining}${formatPct(row.po_remaining, row.po_grand_total)}</div>
+					<div style="display:flex; width:100%; height:10px; border-radius:4px; overflow:hidden; background:#ccc;">
+						<div style="width:${poPctPaid}%; background:green; height:100%;"></div>
+						<div style="width:${poPctRemaining}%; background:red; height:100%;"></div>
+					</div>
+				</div>
+			`;
+		}
+
+		const budgetName = frappe.format(row.budget || 0, { fieldtype: "Currency" });
+
+		return `
+			<tr>
+				<td>${refLink}</td>
+				<td>${row.reference_doctype || "NA"}</td>
+				<td>${frappe.format(row.po_grand_total || 0, { fieldtype: "Currency" })}</td>
+				<td>${poRemainingValue}</td>
+				<td><a href="/app/payment-request/${row.payment_request}">${row.payment_request}</a></td>
+				<td>${frappe.format(row.grand_total || 0, { fieldtype: "Currency" })}</td>
+				<td>${remainingValue}</td>
+				<td>${supplierBlock}</td>
+				<td>${budgetName}</td>
+				<td>${tracker_html}</td>
+			</tr>
+		`;
+	}
+
+	function bindTrackerDialog() {
 		// Attach click handler for View Table (tracker) — delegated
 		$(table_container).off("click", ".view-tracker").on("click", ".view-tracker", function () {
 			let tracker_name = $(this).data("tracker");
 			let grand_total = parseFloat($(this).data("grandTotal")) || 0;
 
-			frappe.call({
-				method: "cash_management.cash_management.page.payment_management.payment_management.get_tracker_child_table",
-				args: { tracker_name },
-				callback: function (res) {
-					if (!res.message) return;
-					let child_rows = res.message.child_rows || [];
-					let totals = res.message.totals || {};
-					let payment_entries = res.message.payment_entries || [];
-
-					// helpers to render tables
-					const renderReadOnlyTable = (rows) => {
-						if (!rows.length) return "<p>No child rows found.</p>";
-						return `
-							<table class="table table-bordered">
+			const showTrackerDialog = function (res) {
+				if (!res.message) return;
+				let child_rows = res.message.child_rows || [];
+				let totals = res.message.totals || {};
+				let payment_entries = res.message.payment_entries || [];
+
+				// helpers to render tables
+				const renderReadOnlyTable = (rows) => {
+					if (!rows.length) return "<p>No child rows found.</p>";
+					return `
+						<table class="table table-bordered">
+							<thead>
+								<tr>
+									<th>Transaction Date</th>
+									<th>Paid %</th>
+									<th>Paid Amount</th>
+								</tr>
+							</thead>
+							<tbody>
+								${rows.map(c => {
+						const paidPct = formatPct(c.paid_amount, grand_total);
+						return `<tr>
+										<td>${c.transaction_date || "NA"}</td>
+										<td>${c.paid || 0}</td>
+										<td>${c.paid_amount || 0}${paidPct}</td>
+									</tr>`;
+					}).join("")}
+							</tbody>
+						</table>
+						<p class="text-muted mt-2 mb-0">Click <b>Edit</b> to modify rows.</p>
+					`;
+				};
+
+				const renderPaymentEntriesTable = (entries) => {
+					if (!entries.length) return "<p>No Payment Entries found for this Payment Request.</p>";
+					return `
+						<table class="table table-bordered">
+							<thead>
+								<tr>
+									<th>Payment Entry</th>
+									<th>Posting Date</th>
+									<th>Paid Amount</th>
+									<th>Party</th>
+									<th>Mode of Payment</th>
+									<th>Status</th>
+								</tr>
+							</thead>
+							<tbody>
+								${entries.map(e => {
+						const pePct = formatPct(e.paid_amount, grand_total);
+						return `<tr>
+										<td><a href="/app/payment-entry/${e.name}">${e.name}</a></td>
+										<td>${e.posting_date || "NA"}</td>
+										<td>${e.paid_amount || 0}${pePct}</td>
+										<td>${e.party || "NA"}</td>
+										<td>${e.mode_of_payment || "NA"}</td>
+										<td>${e.status || "NA"}</td>
+									</tr>`;
+					}).join("")}
+							</tbody>
+						</table>
+					`;
+				};
+
+				const renderEditableTable = (rows) => {
+					return `
+						<div class="tracker-edit-wrap" style="overflow:auto;">
+							<table class="table table-bordered edit-table mb-3">
 								<thead>
 									<tr>
 										<th>Transaction Date</th>
-										<th>Paid %</th>
+										<th>Paid</th>
 										<th>Paid Amount</th>
+										<th>Actions</th>
 									</tr>
 								</thead>
 								<tbody>
-									${rows.map(c => {
-							const paidPct = formatPct(c.paid_amount, grand_total);
-							return `<tr>
-											<td>${c.transaction_date || "NA"}</td>
-											<td>${c.paid || 0}</td>
-											<td>${c.paid_amount || 0}${paidPct}</td>
-										</tr>`;
-						}).join("")}
+									${(rows.length ? rows : [{}]).map(c => `<tr data-row-key="${c.row_key || ""}">
+										<td><input type="date" class="form-control" data-field="transaction_date" value="${c.transaction_date || ""}"></td>
+										<td><input type="number" class="form-control" data-field="paid" value="${c.paid ?? 0}"></td>
+										<td><input type="number" class="form-control" data-field="paid_amount" value="${c.paid_amount ?? 0}"></td>
+										<td style="width:1%;white-space:nowrap;">
+											<button class="btn btn-danger btn-sm remove-row">Remove</button>
+										</td>
+									</tr>`).join("")}
 								</tbody>
 							</table>
-							<p class="text-muted mt-2 mb-0">Click <b>Edit</b> to modify rows.</p>
-						`;
-					};
-
-					const renderPaymentEntriesTable = (entries) => {
-						if (!entries.length) return "<p>No Payment Entries found for this Payment Request.</p>";
-						return `
-							<table class="table table-bordered">
-								<thead>
-									<tr>
-										<th>Payment Entry</th>
-										<th>Posting Date</th>
-										<th>Paid Amount</th>
-										<th>Party</th>
-										<th>Mode of Payment</th>
-										<th>Status</th>
-									</tr>
-								</thead>
-								<tbody>
-									${entries.map(e => {
-							const pePct = formatPct(e.paid_amount, grand_total);
-							return `<tr>
-											<td><a href="/app/payment-entry/${e.name}">${e.name}</a></td>
-											<td>${e.posting_date || "NA"}</td>
-											<td>${e.paid_amount || 0}${pePct}</td>
-											<td>${e.party || "NA"}</td>
-											<td>${e.mode_of_payment || "NA"}</td>
-											<td>${e.status || "NA"}</td>
-										</tr>`;
-						}).join("")}
-								</tbody>
-							</table>
-						`;
-					};
-
-					const renderEditableTable = (rows) => {
-						return `
-							<div class="tracker-edit-wrap" style="overflow:auto;">
-								<table class="table table-bordered edit-table mb-3">
-									<thead>
-										<tr>
-											<th>Transaction Date</th>
-											<th>Paid</th>
-											<th>Paid Amount</th>
-											<th>Actions</th>
-										</tr>
-									</thead>
-									<tbody>
-										${(rows.length ? rows : [{}]).map(c => `<tr>
-											<td><input type="date" class="form-control" data-field="transaction_date" value="${c.transaction_date || ""}"></td>
-											<td><input type="number" class="form-control" data-field="paid" value="${c.paid ?? 0}"></td>
-											<td><input type="number" class="form-control" data-field="paid_amount" value="${c.paid_amount ?? 0}"></td>
-											<td style="width:1%;white-space:nowrap;">
-												<button class="btn btn-danger btn-sm remove-row">Remove</button>
-											</td>
-										</tr>`).join("")}
-									</tbody>
-								</table>
-								<div class="d-flex justify-content-between">
-									<button class="btn btn-success add-row">+ Add Row</button>
-									<button class="btn btn-primary save-edits">Save Changes</button>
-								</div>
+							<div class="d-flex justify-content-between">
+								<button class="btn btn-success add-row">+ Add Row</button>
+								<button class="btn btn-primary save-edits">Save Changes</button>
 							</div>
-						`;
-					};
-
-					// build dialog
-					let d = new frappe.ui.Dialog({
-						title: `Tracker Details: ${tracker_name}`,
-						size: "extra-large",
-						fields: [
-							{ fieldtype: "Float", fieldname: "total_amount_paid", label: "Total Amount Paid", default: totals.total_amount_paid || 0, read_only: 1 },
-							{ fieldtype: "Float", fieldname: "total_amount_remaining", label: "Total Amount Remaining", default: totals.total_amount_remaining || 0, read_only: 1 },
-							{
-								fieldtype: "Button", fieldname: "refresh_details", label: "Refresh Details", click: function () {
-									frappe.call({
-										method: "cash_management.cash_management.page.payment_management.payment_management.get_tracker_child_table",
-										args: { tracker_name },
-										callback: function (res2) {
-											if (!res2.message) return;
-											child_rows = res2.message.child_rows || [];
-											totals = res2.message.totals || [];
-											payment_entries = res2.message.payment_entries || [];
-											d.set_value("total_amount_paid", totals.total_amount_paid || 0);
-											d.set_value("total_amount_remaining", totals.total_amount_remaining || 0);
-											d.fields_dict.child_table_html.$wrapper.html(renderReadOnlyTable(child_rows));
-											d.fields_dict.payment_entries_html.$wrapper.html(renderPaymentEntriesTable(payment_entries));
-										}
-									});
-								}
-							},
-							{ fieldtype: "HTML", fieldname: "child_table_html", options: renderReadOnlyTable(child_rows) },
-							{ fieldtype: "HTML", fieldname: "payment_entries_html", options: renderPaymentEntriesTable(payment_entries) }
-						],
-						primary_action_label: "Close",
-						primary_action() { d.hide(); },
-						secondary_action_label: "Edit",
-						secondary_action() {
-							d.set_df_property("total_amount_paid", "read_only", 0);
-							d.set_df_property("total_amount_remaining", "read_only", 0);
-							d.refresh_fields(["total_amount_paid", "total_amount_remaining"]);
-							const $wrap = d.fields_dict.child_table_html.$wrapper;
-							$wrap.html(renderEditableTable(child_rows));
-
-							// Add/remove/save handlers
-							$wrap.off("click", ".add-row").on("click", ".add-row", function () {
-								$wrap.find(".edit-table tbody").append(`
-									<tr>
-										<td><input type="date" class="form-control" data-field="transaction_date"></td>
-										<td><input type="number" class="form-control" data-field="paid" value="0"></td>
-										<td><input type="number" class="form-control" data-field="paid_amount" value="0"></td>
-										<td><button class="btn btn-danger btn-sm remove-row">Remove</button></td>
-									</tr>
-								`);
-							});
-							$wrap.off("click", ".remove-row").on("click", ".remove-row", function () { $(this).closest("tr").remove(); });
-
-							$wrap.off("click", ".save-edits").on("click", ".save-edits", function () {
-								let updated_rows = [];
-								$wrap.find(".edit-table tbody tr").each(function () {
-									let row = {};
-									$(this).find("input").each(function () {
-										row[$(this).data("field")] = $(this).val();
-									});
-									updated_rows.push(row);
-								});
-
-								let totals_payload = {
-									total_amount_paid: d.get_value("total_amount_paid"),
-									total_amount_remaining: d.get_value("total_amount_remaining")
-								};
-
+						</div>
+					`;
+				};
+
+				// build dialog
+				let d = new frappe.ui.Dialog({
+					title: `Tracker Details: ${tracker_name}`,
+					size: "extra-large",
+					fields: [
+						{ fieldtype: "Float", fieldname: "total_amount_paid", label: "Total Amount Paid", default: totals.total_amount_paid || 0, read_only: 1 },
+						{ fieldtype: "Float", fieldname: "total_amount_remaining", label: "Total Amount Remaining", default: totals.total_amount_remaining || 0, read_only: 1 },
+						{
+							fieldtype: "Button", fieldname: "refresh_details", label: "Refresh Details", click: function () {
 								frappe.call({
-									method: "cash_management.cash_management.page.payment_management.payment_management.update_tracker_child_table",
-									args: { tracker_name: tracker_name, rows: updated_rows, totals: totals_payload },
-									callback: function (res) {
-										if (!res.exc) {
-											frappe.msgprint("Tracker updated successfully");
-											d.hide();
-											loadData(); // refresh main table
-										}
+									method: "cash_management.cash_management.page.payment_management.payment_management.get_tracker_child_table",
+									args: { tracker_name },
+									callback: function (res2) {
+										if (!res2.message) return;
+										tracker_details[tracker_name] = res2.message;
+										child_rows = res2.message.child_rows || [];
+										totals = res2.message.totals || [];
+										payment_entries = res2.message.payment_entries || [];
+										d.set_value("total_amount_paid", totals.total_amount_paid || 0);
+										d.set_value("total_amount_remaining", totals.total_amount_remaining || 0);
+										d.fields_dict.child_table_html.$wrapper.html(renderReadOnlyTable(child_rows));
+										d.fields_dict.payment_entries_html.$wrapper.html(renderPaymentEntriesTable(payment_entries));
 									}
 								});
+							}
+						},
+						{ fieldtype: "HTML", fieldname: "child_table_html", options: renderReadOnlyTable(child_rows) },
+						{ fieldtype: "HTML", fieldname: "payment_entries_html", options: renderPaymentEntriesTable(payment_entries) }
+					],
+					primary_action_label: "Close",
+					primary_action() { d.hide(); },
+					secondary_action_label: "Edit",
+					secondary_action() {
+						d.set_df_property("total_amount_paid", "read_only", 0);
+						d.set_df_property("total_amount_remaining", "read_only", 0);
+						d.refresh_fields(["total_amount_paid", "total_amount_remaining"]);
+						const $wrap = d.fields_dict.child_table_html.$wrapper;
+						$wrap.html(renderEditableTable(child_rows));
+
+						// Add/remove/save handlers
+						$wrap.off("click", ".add-row").on("click", ".add-row", function () {
+							$wrap.find(".edit-table tbody").append(`
+								<tr>
+									<td><input type="date" class="form-control" data-field="transaction_date"></td>
+									<td><input type="number" class="form-control" data-field="paid" value="0"></td>
+									<td><input type="number" class="form-control" data-field="paid_amount" value="0"></td>
+									<td><button class="btn btn-danger btn-sm remove-row">Remove</button></td>
+								</tr>
+							`);
+						});
+						$wrap.off("click", ".remove-row").on("click", ".remove-row", function () { $(this).closest("tr").remove(); });
+
+						$wrap.off("click", ".save-edits").on("click", ".save-edits", function () {
+							let updated_rows = [];
+							$wrap.find(".edit-table tbody tr").each(function () {
+								// row_key ties the row to the Payment Entry it already posted
+								let row = { row_key: $(this).attr("data-row-key") || "" };
+								$(this).find("input").each(function () {
+									row[$(this).data("field")] = $(this).val();
+								});
+								updated_rows.push(row);
 							});
-						}
-					});
-
-					// show dialog first so footer buttons are rendered
-					d.show();
-
-					// 🔑 Hide Edit if PR Remaining is 0
-					const prRemaining = totals.total_amount_remaining || 0;
-					if (prRemaining <= 0) {
-						try {
-							if (typeof d.get_secondary_btn === 'function') {
-								const $sec = d.get_secondary_btn();
-								if ($sec && $sec.length) {
-									$sec.hide();
+
+							let totals_payload = {
+								total_amount_paid: d.get_value("total_amount_paid"),
+								total_amount_remaining: d.get_value("total_amount_remaining")
+							};
+
+							// Payment Entries are posted in the background; follow its realtime progress
+							let job_id = null;
+							const $save = $wrap.find(".save-edits").prop("disabled", true);
+							const progress_title = __("Posting Payment Entries");
+
+							const onProgress = function (data) {
+								if (data.tracker !== tracker_name || (job_id && data.job_id !== job_id)) return;
+
+								if (data.status === "progress") {
+									frappe.show_progress(progress_title, data.done, data.total, __("Processed {0} of {1} rows, {2} Payment Entries posted", [data.done, data.total, data.posted]));
+									return;
+								}
+								if (data.status === "started") return;
+
+								frappe.realtime.off("cash_management_tracker_update", onProgress);
+								frappe.hide_progress();
+								$save.prop("disabled", false);
+
+								if (data.status === "completed") {
+									delete tracker_details[tracker_name];
+									frappe.msgprint("Tracker updated successfully");
+									d.hide();
+									loadData(); // refresh main table
+								} else {
+									frappe.msgprint({ title: __("Tracker not updated"), message: data.message, indicator: "red" });
+								}
+							};
+							frappe.realtime.on("cash_management_tracker_update", onProgress);
+
+							frappe.call({
+								method: "cash_management.cash_management.page.payment_management.payment_management.update_tracker_child_table",
+								args: { tracker_name: tracker_name, rows: updated_rows, totals: totals_payload, enqueue: 1 },
+								callback: function (res) {
+									if (res.exc || !res.message) return;
+									job_id = res.message.job_id;
+									frappe.show_alert({ message: __("Saving tracker in the background..."), indicator: "blue" }, 3);
+								},
+								error: function () {
+									frappe.realtime.off("cash_management_tracker_update", onProgress);
+									$save.prop("disabled", false);
 								}
+							});
+						});
+					}
+				});
+
+				// show dialog first so footer buttons are rendered
+				d.show();
+
+				// 🔑 Hide Edit if PR Remaining is 0
+				const prRemaining = totals.total_amount_remaining || 0;
+				if (prRemaining <= 0) {
+					try {
+						if (typeof d.get_secondary_btn === 'function') {
+							const $sec = d.get_secondary_btn();
+							if ($sec && $sec.length) {
+								$sec.hide();
 							}
-						} catch (e) {
-							// ignore
-						}
-
-						// fallback: find the button by text "Edit" (case-insensitive)
-						if (d.$wrapper && d.$wrapper.find) {
-							d.$wrapper.find('.modal-footer button').filter(function () {
-								return $(this).text().trim().toLowerCase() === 'edit';
-							}).hide();
 						}
+					} catch (e) {
+						// ignore
+					}
 
-						// optional: add a short notice so user knows why editing is disabled
-						if (d.fields_dict && d.fields_dict.child_table_html) {
-							d.fields_dict.child_table_html.$wrapper.prepend(
-								'<div class="alert alert-info mb-2">Editing disabled because Purchase Request is paid off</div>'
-							);
-						}
+					// fallback: find the button by text "Edit" (case-insensitive)
+					if (d.$wrapper && d.$wrapper.find) {
+						d.$wrapper.find('.modal-footer button').filter(function () {
+							return $(this).text().trim().toLowerCase() === 'edit';
+						}).hide();
+					}
 
-						console.log("PR Remaining = 0 → hiding Edit button");
+					// optional: add a short notice so user knows why editing is disabled
+					if (d.fields_dict && d.fields_dict.child_table_html) {
+						d.fields_dict.child_table_html.$wrapper.prepend(
+							'<div class="alert alert-info mb-2">Editing disabled because Purchase Request is paid off</div>'
+						);
 					}
+
+					console.log("PR Remaining = 0 → hiding Edit button");
+				}
+			};
+
+			if (tracker_details[tracker_name]) {
+				showTrackerDialog({ message: tracker_details[tracker_name] });
+				return;
+			}
+
+			frappe.call({
+				method: "cash_management.cash_management.page.payment_management.payment_management.get_tracker_child_table",
+				args: { tracker_name },
+				callback: function (res) {
+					if (res.message) tracker_details[tracker_name] = res.message;
+					showTrackerDialog(res);
 				}
 			});
 		});
 	}
 
-	// loadData: call your original python method
+	// prefetchTrackerDetails: load the dialog data of all trackers in `rows` with one call
+	function prefetchTrackerDetails(rows) {
+		const token = load_token;
+		const tracker_names = [...new Set(rows.map(row => row.tracker).filter(name => name && !tracker_details[name]))];
+		if (!tracker_names.length) return;
+
+		frappe.call({
+			method: "cash_management.cash_management.page.payment_management.payment_management.get_tracker_child_tables",
+			args: { tracker_names },
+			callback: function (r) {
+				if (token !== load_token || !r.message) return;
+				Object.assign(tracker_details, r.message);
+			}
+		});
+	}
+
+	function getListMethod() {
+		return active_tab_doctype === "Invoice Released Memo"
+			? "cash_management.cash_management.page.payment_management.payment_management.get_payment_requester_entries"
+			: active_tab_doctype === "Sales Order"
+				? "cash_management.cash_management.page.payment_management.payment_management.get_payment_request_inward_entries"
+				: "cash_management.cash_management.page.payment_management.payment_management.get_payment_request_entries";
+	}
+
+	// loadData: (re)load the first page for the current tab and filters
 	function loadData() {
+		const token = ++load_token;
+		next_cursor = null;
+		is_loading = true;
+
 		frappe.call({
-			method:
-				active_tab_doctype === "Invoice Released Memo"
-					? "cash_management.cash_management.page.payment_management.payment_management.get_payment_requester_entries"
-					: active_tab_doctype === "Sales Order"
-						? "cash_management.cash_management.page.payment_management.payment_management.get_payment_request_inward_entries"
-						: "cash_management.cash_management.page.payment_management.payment_management.get_payment_request_entries",
+			method: getListMethod(),
 			args: {
-				filters: filters
+				filters: filters,
+				limit: PAGE_LENGTH
 			},
 			freeze: true,
 			freeze_message: __("Loading data..."),
 			callback: function (r) {
-				if (r.message) {
-					renderTable(r.message);
+				if (token !== load_token) return; // a newer load superseded this one
+				const page = r.message || {};
+				const rows = page.rows || [];
+				next_cursor = page.next_cursor || null;
+				total_count = page.total_count || 0;
+				loaded_count = rows.length;
+
+				tracker_details = {};
+				if (rows.length || next_cursor) {
+					renderTable(rows);
+					renderLoadMore();
+					prefetchTrackerDetails(rows);
 				} else {
 					table_container.empty().html(`<div class="text-muted">No records found.</div>`);
 				}
+			},
+			always: function () {
+				if (token === load_token) is_loading = false;
+			}
+		});
+	}
+
+	// loadMore: append the next page after the current cursor
+	function loadMore() {
+		if (is_loading || !next_cursor) return;
+		const token = load_token;
+		is_loading = true;
+
+		frappe.call({
+			method: getListMethod(),
+			args: {
+				filters: filters,
+				limit: PAGE_LENGTH,
+				cursor: next_cursor
+			},
+			callback: function (r) {
+				if (token !== load_token) return;
+				const page = r.message || {};
+				const rows = page.rows || [];
+				next_cursor = page.next_cursor || null;
+				loaded_count += rows.length;
+				appendRows(rows);
+				renderLoadMore();
+				prefetchTrackerDetails(rows);
+			},
+			always: function () {
+				if (token === load_token) is_loading = false;
 			}
 		});
 	}
@@ -142,7 +142,18 @@ frappe.pages['payment-management-budget'].on_page_load = function (wrapper) {
 			// ------------------------- SECTION 3 (3 fields) -------------------------
 			{ fieldtype: 'Section Break', },
 
-			{ fieldtype: 'Link', label: 'Payment Request', fieldname: 'payment_request', options: 'Payment Request' },
+			{
+				fieldtype: 'Link',
+				label: 'Payment Request',
+				fieldname: 'payment_request',
+				options: 'Payment Request',
+				get_query: function () {
+					return {
+						query: 'cash_management.cash_management.doctype.payment_search_trigram.payment_search_trigram.search_payment_names',
+						filters: { source_doctype: 'Payment Request', field: 'name' }
+					};
+				}
+			},
 			{ fieldtype: 'Column Break' },
 
 			{ fieldtype: 'Link', label: 'Reference Doctype', fieldname: 'reference_doctype', options: 'DocType' },
@@ -156,7 +167,11 @@ frappe.pages['payment-management-budget'].on_page_load = function (wrapper) {
 				get_query: function () {
 					const selected_doctype = filters.reference_doctype;
 					if (!selected_doctype) frappe.throw(__('Please select Reference Doctype first'));
-					return { doctype: selected_doctype, filters: {} };
+					return {
+						doctype: selected_doctype,
+						query: 'cash_management.cash_management.doctype.payment_search_trigram.payment_search_trigram.search_payment_names',
+						filters: { source_doctype: 'Payment Request', field: 'reference_name', reference_doctype: selected_doctype }
+					};
 				}
 			},
 
@@ -275,7 +290,135 @@ frappe.pages['payment-management-budget'].on_page_load = function (wrapper) {
 		fg.set_value('remaining_budget', target - budget);
 	}
 
-	// renderTable (unchanged)
+	// 🔹 Budget edits waiting to be saved, keyed by tracker
+	let pending_budgets = {};
+	let budget_flush_timer = null;
+
+	// flushBudgets: save all pending budget edits in one call; resolves once the save has finished
+	function flushBudgets() {
+		const budgets = Object.entries(pending_budgets).map(([tracker, budget]) => ({ tracker, budget }));
+		pending_budgets = {};
+		if (!budgets.length) return Promise.resolve();
+
+		return new Promise(resolve => frappe.call({
+			method: "cash_management.cash_management.page.payment_management_budget.payment_management_budget.update_tracker_budgets",
+			args: { budgets },
+			callback: function (res) {
+				if (res.exc || !res.message) {
+					frappe.msgprint("Failed to update budget");
+					return;
+				}
+
+				// 🟢 Differential Update: add what each row now contributes minus what it contributed before
+				let diff = 0;
+				(res.message.rows || []).forEach(row => {
+					const $input = $(table_container).find(`.budget-input[data-tracker="${row.tracker}"]`);
+					if (!$input.length) return;
+					const new_budget = parseFloat(row.budget) || 0;
+					diff += new_budget - (parseFloat($input.attr("data-original-budget")) || 0);
+					$input.attr("data-original-budget", new_budget);
+				});
+
+				let updated_total = (parseFloat(fg.get_value('budget')) || 0) + diff;
+				fg.set_value('budget', updated_total);
+				updateRemainingBudget();
+
+				frappe.show_alert({
+					message: __("Budget updated for {0} trackers", [budgets.length]),
+					indicator: "green"
+				}, 3);
+			},
+			always: resolve
+		}));
+	}
+
+	// buildRowHtml: one table row
+	function buildRowHtml(row) {
+		const refLink = (row.reference_doctype && row.reference_name)
+			? `<a href="/app/${frappe.router.slug(row.reference_doctype)}/${row.reference_name}">${row.reference_name}</a>`
+			: (row.reference_name || "NA");
+
+		const supplierBlock = (() => {
+			const supplierHtml = row.supplier_id
+				? `<a href="/app/supplier/${row.supplier_id}">${row.supplier_name || row.supplier_id}</a>`
+				: (row.supplier_name || "NA");
+			const termsHtml = row.payment_terms ? `<div class="text-muted" style="font-size:12px;">Terms: ${row.payment_terms}</div>` : "";
+			return `${supplierHtml}${termsHtml}`;
+		})();
+
+		// Payment Request Remaining column
+		const remainingAmount = row.total_amount_remaining || 0;
+		const pctRemaining = row.grand_total ? (remainingAmount / row.grand_total) * 100 : 0;
+		const pctPaid = 100 - pctRemaining;
+		const remainingValue = `
+			<div style="display:flex; flex-direction:column; gap:2px;">
+				<div>${remainingAmount}${formatPct(remainingAmount, row.grand_total)}</div>
+				<div style="display:flex; width:100%; height:10px; border-radius:4px; overflow:hidden; background:#ccc;">
+					<div style="width:${pctPaid}%; background:green; height:100%;"></div>
+					<div style="width:${pctRemaining}%; background:red; height:100%;"></div>
+				</div>
+			</div>
+		`;
+
+		// Purchase Order or Invoice Released Memo Remaining column
+		let poRemainingValue = "NA";
+		if (row.po_grand_total != null) {
+			const poPaid = row.po_grand_total - (row.po_remaining || 0);
+			const poPctRemaining = row.po_grand_total ? (row.po_remaining / row.po_grand_total) * 100 : 0;
+			const poPctPaid = 100 - poPctRemaining;
+
+			poRemainingValue = `
+				<div style="display:flex; flex-direction:column; gap:2px;">
+					<div>${row.po_remaining}${formatPct(row.po_remaining, row.po_grand_total)}</div>
+					<div style="display:flex; width:100%; height:10px; border-radius:4px; overflow:hidden; background:#ccc;">
+						<div style="width:${poPctPaid}%; background:green; height:100%;"></div>
+						<div style="width:${poPctRemaining}%; background:red; height:100%;"></div>
+					</div>
+				</div>
+			`;
+		}
+
+		// Tracker link
+		const trackerLink = row.tracker
+			? `<a href="/app/payment-request-tracker/${row.tracker}">${row.tracker}</a>`
+			: "NA";
+
+		// Budget input field
+		const budgetValue = row.budget || row.po_remaining || 0;
+		// 🧠 Important: Load logic sums (row.budget || 0). If row.budget is falsy, it contributes 0 to the total.
+		// We must track this original contribution to perform differential updates correctly.
+		const originalBudgetContribution = row.budget || 0;
+
+		const budgetInput = row.tracker
+			? `<input type="number" class="form-control budget-input" 
+					data-tracker="${row.tracker}"
+					data-original-budget="${originalBudgetContribution}" 
+					value="${budgetValue}" 
+					style="width:150px;">`
+			: "NA";
+
+		return `
+			<tr>
+				<td>${refLink}</td>
+				<td>${row.reference_doctype || "NA"}</td>
+				<td>${frappe.format(row.po_grand_total || 0, { fieldtype: "Currency" })}</td>
+				<td>${poRemainingValue}</td>
+				<td><a href="/app/payment-request/${row.payment_request}">${row.payment_request}</a></td>
+				<td>${frappe.format(row.grand_total || 0, { fieldtype: "Currency" })}</td>
+				<td>${remainingValue}</td>
+				<td>${supplierBlock}</td>
+				<td>${trackerLink}</td>
+				<td>${budgetInput}</td>
+			</tr>
+		`;
+	}
+
+	// appendRows: add rows to the table rendered by renderTable
+	function appendRows(data) {
+		$(table_container).find("tbody.budget-rows").append(data.map(buildRowHtml).join(""));
+	}
+
+	// renderTable: table header for the active tab, then the given rows
 	function renderTable(data) {
 		// 🔹 Dynamic column labels based on active tab
 		let amountLabel = "Purchase Order Amount";
@@ -289,86 +432,6 @@ frappe.pages['payment-management-budget'].on_page_load = function (wrapper) {
 			remainingLabel = "SO Remaining";
 		}
 
-		let rows = data.map(row => {
-			const refLink = (row.reference_doctype && row.reference_name)
-				? `<a href="/app/${frappe.router.slug(row.reference_doctype)}/${row.reference_name}">${row.reference_name}</a>`
-				: (row.reference_name || "NA");
-
-			const supplierBlock = (() => {
-				const supplierHtml = row.supplier_id
-					? `<a href="/app/supplier/${row.supplier_id}">${row.supplier_name || row.supplier_id}</a>`
-					: (row.supplier_name || "NA");
-				const termsHtml = row.payment_terms ? `<div class="text-muted" style="font-size:12px;">Terms: ${row.payment_terms}</div>` : "";
-				return `${supplierHtml}${termsHtml}`;
-			})();
-
-			// Payment Request Remaining column
-			const remainingAmount = row.total_amount_remaining || 0;
-			const pctRemaining = row.grand_total ? (remainingAmount / row.grand_total) * 100 : 0;
-			const pctPaid = 100 - pctRemaining;
-			const remainingValue = `
-				<div style="display:flex; flex-direction:column; gap:2px;">
-					<div>${remainingAmount}${formatPct(remainingAmount, row.grand_total)}</div>
-					<div style="display:flex; width:100%; height:10px; border-radius:4px; overflow:hidden; background:#ccc;">
-						<div style="width:${pctPaid}%; background:green; height:100%;"></div>
-						<div style="width:${pctRemaining}%; background:red; height:100%;"></div>
-					</div>
-				</div>
-			`;
-
-			// Purchase Order or Invoice Released Memo Remaining column
-			let poRemainingValue = "NA";
-			if (row.po_grand_total != null) {
-				const poPaid = row.po_grand_total - (row.po_remaining || 0);
-				const poPctRemaining = row.po_grand_total ? (row.po_remaining / row.po_grand_total) * 100 : 0;
-				const poPctPaid = 100 - poPctRemaining;
-
-				poRemainingValue = `
-					<div style="display:flex; flex-direction:column; gap:2px;">
-						<div>${row.po_remaining}${formatPct(row.po_remaining, row.po_grand_total)}</div>
-						<div style="display:flex; width:100%; height:10px; border-radius:4px; overflow:hidden; background:#ccc;">
-							<div style="width:${poPctPaid}%; background:green; height:100%;"></div>
-							<div style="width:${poPctRemaining}%; background:red; height:100%;"></div>
-						</div>
-					</div>
-				`;
-			}
-
-			// Tracker link
-			const trackerLink = row.tracker
-				? `<a href="/app/payment-request-tracker/${row.tracker}">${row.tracker}</a>`
-				: "NA";
-
-			// Budget input field
-			const budgetValue = row.budget || row.po_remaining || 0;
-			// 🧠 Important: Load logic sums (row.budget || 0). If row.budget is falsy, it contributes 0 to the total.
-			// We must track this original contribution to perform differential updates correctly.
-			const originalBudgetContribution = row.budget || 0;
-
-			const budgetInput = row.tracker
-				? `<input type="number" class="form-control budget-input" 
-						data-tracker="${row.tracker}"
-						data-original-budget="${originalBudgetContribution}" 
-						value="${budgetValue}" 
-						style="width:150px;">`
-				: "NA";
-
-			return `
-				<tr>
-					<td>${refLink}</td>
-					<td>${row.reference_doctype || "NA"}</td>
-					<td>${frappe.format(row.po_grand_total || 0, { fieldtype: "Currency" })}</td>
-					<td>${poRemainingValue}</td>
-					<td><a href="/app/payment-request/${row.payment_request}">${row.payment_request}</a></td>
-					<td>${frappe.format(row.grand_total || 0, { fieldtype: "Currency" })}</td>
-					<td>${remainingValue}</td>
-					<td>${supplierBlock}</td>
-					<td>${trackerLink}</td>
-					<td>${budgetInput}</td>
-				</tr>
-			`;
-		}).join("");
-
 		let html = `
 			<table class="table table-bordered">
 				<thead>
@@ -385,90 +448,127 @@ frappe.pages['payment-management-budget'].on_page_load = function (wrapper) {
 						<th>Budget</th>
 					</tr>
 				</thead>
-				<tbody>${rows}</tbody>
+				<tbody class="budget-rows"></tbody>
 			</table>
+			<div class="text-muted stream-status"></div>
 		`;
 
 		$(table_container).html(html);
+		appendRows(data);
 
-		// Attach change handler for budget inputs
+		// Attach change handler for budget inputs: edits are collected and saved together
 		$(table_container).off("change", ".budget-input").on("change", ".budget-input", function () {
 			const $input = $(this);
-			const tracker_name = $input.data("tracker");
-			const new_budget = parseFloat($input.val()) || 0;
-
-			// Get the previous contribution of this specific row to the total budget
-			// If it was never set (null in DB), it contributed 0.
-			const original_contribution = parseFloat($input.attr("data-original-budget")) || 0;
+			pending_budgets[$input.data("tracker")] = parseFloat($input.val()) || 0;
 
-			frappe.call({
-				method: "cash_management.cash_management.page.payment_management_budget.payment_management_budget.update_tracker_budget",
-				args: { tracker_name, budget: new_budget },
-				callback: function (res) {
-					if (!res.exc) {
-						frappe.show_alert({
-							message: `Budget updated to ${frappe.format(new_budget, { fieldtype: "Currency" })}`,
-							indicator: "green"
-						}, 3);
-
-						// 🟢 OPTIMIZED: Differential Update
-						// Calculate difference: new value - what it previously contributed
-						const diff = new_budget - original_contribution;
-
-						// Update global budget
-						let current_total = parseFloat(fg.get_value('budget')) || 0;
-						let updated_total = current_total + diff;
-						fg.set_value('budget', updated_total);
-
-						// Update remaining budget
-						const target = parseFloat(fg.get_value('target_budget')) || 0;
-						fg.set_value('remaining_budget', target - updated_total);
-
-						// Update the 'original' attribute so subsequent changes calculate diff correctly against THIS new value
-						$input.attr("data-original-budget", new_budget);
-
-						// Removed loadData()
-					} else {
-						frappe.msgprint("Failed to update budget");
-					}
-				}
-			});
+			clearTimeout(budget_flush_timer);
+			budget_flush_timer = setTimeout(flushBudgets, 800);
 		});
 	}
 
-	// loadData: call your original python method
+	// loadData: stream the rows of the active tab and render them as they arrive
+	let load_token = 0;
+	let load_controller = null;
+
+	function getListType() {
+		return active_tab_doctype === "Invoice Released Memo"
+			? "payment_requester"
+			: active_tab_doctype === "Sales Order"
+				? "payment_request_inward"
+				: "payment_request";
+	}
+
 	function loadData() {
-		frappe.call({
-			method:
-				active_tab_doctype === "Invoice Released Memo"
-					? "cash_management.cash_management.page.payment_management_budget.payment_management_budget.get_payment_requester_entries"
-					: active_tab_doctype === "Sales Order"
-						? "cash_management.cash_management.page.payment_management_budget.payment_management_budget.get_payment_request_inward_entries"
-						: "cash_management.cash_management.page.payment_management_budget.payment_management_budget.get_payment_request_entries",
-			args: {
-				filters: filters
+		const token = ++load_token;
+		if (load_controller) load_controller.abort();
+		load_controller = new AbortController();
+		const signal = load_controller.signal;
+
+		// save edits still waiting for the debounce, and only stream once they are stored
+		clearTimeout(budget_flush_timer);
+		flushBudgets().then(() => {
+			if (token === load_token) streamData(token, signal);
+		});
+	}
+
+	function streamData(token, signal) {
+		let total_budget = 0;
+		let row_count = 0;
+		fg.set_value('budget', 0);
+		updateRemainingBudget();
+		renderTable([]);
+		const $status = $(table_container).find(".stream-status").text(__("Loading data..."));
+
+		fetch("/api/method/cash_management.cash_management.page.payment_management_budget.payment_management_budget.stream_entries", {
+			method: "POST",
+			headers: {
+				"Accept": "application/x-ndjson",
+				"Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+				"X-Frappe-CSRF-Token": frappe.csrf_token
 			},
-			freeze: true,
-			freeze_message: __("Loading data..."),
-			callback: function (r) {
-				if (r.message) {
-					// Calculate total budget (budget only)
-					const total_budget = r.message.reduce((sum, row) => {
-						return sum + (parseFloat(row.budget) || 0);
-					}, 0);
-					fg.set_value('budget', total_budget);
-					updateRemainingBudget();
-
-					renderTable(r.message);
-				} else {
-					fg.set_value('budget', 0);
-					updateRemainingBudget();
-					table_container.empty().html(`<div class="text-muted">No records found.</div>`);
-				}
+			body: new URLSearchParams({ list_type: getListType(), filters: JSON.stringify(filters) }),
+			signal
+		}).then(response => {
+			if (!response.ok) throw new Error(response.statusText);
+			return readStream(response.body.getReader(), rows => {
+				if (token !== load_token) return;
+
+				// Calculate total budget (budget only)
+				total_budget = rows.reduce((sum, row) => sum + (parseFloat(row.budget) || 0), total_budget);
+				row_count += rows.length;
+				fg.set_value('budget', total_budget);
+				updateRemainingBudget();
+
+				appendRows(rows);
+				$status.text(__("Loaded {0} rows...", [row_count]));
+			});
+		}).then(() => {
+			if (token !== load_token) return;
+			if (row_count) {
+				$status.empty();
+			} else {
+				table_container.empty().html(`<div class="text-muted">No records found.</div>`);
 			}
+		}).catch(error => {
+			if (error.name === "AbortError" || token !== load_token) return;
+			$status.empty();
+			frappe.msgprint(error.message || __("Failed to load data."));
 		});
 	}
 
+	// readStream: parse newline-delimited JSON, handing over the rows of every network chunk
+	function readStream(reader, onRows) {
+		const decoder = new TextDecoder();
+		let buffer = "";
+
+		function parse(lines) {
+			const rows = [];
+			lines.forEach(line => {
+				if (!line.trim()) return;
+				const row = JSON.parse(line);
+				if (row.error) throw new Error(row.error);
+				rows.push(row);
+			});
+			if (rows.length) onRows(rows);
+		}
+
+		function pump() {
+			return reader.read().then(({ done, value }) => {
+				if (done) {
+					parse([buffer]);
+					return;
+				}
+				buffer += decoder.decode(value, { stream: true });
+				const lines = buffer.split("\n");
+				buffer = lines.pop();
+				parse(lines);
+				return pump();
+			});
+		}
+
+		return pump();
+	}
+
 	// 🔹 Tab switching logic
 	$('#doctypeTabs a').on('click', function (e) {
 		e.preventDefault();
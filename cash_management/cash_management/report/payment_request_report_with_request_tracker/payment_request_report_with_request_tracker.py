@@ -2,6 +2,8 @@ import frappe
 from frappe import _
 from frappe.utils import getdate
 
+from cash_management.cash_management.doctype.payment_request_tracker.payment_request_tracker import SYNC_SOURCES
+
 def execute(filters=None):
     filters = filters or {}
     columns = get_columns()
@@ -22,87 +24,48 @@ def get_columns():
 
 
 def get_data(filters):
-    data = []
     reference_type = filters.get("reference_type") or "Payment Request"  # 🔸 Default to Payment Request
-
-    # Fetch PRTs
-    prts = frappe.get_all(
-        "Payment Request Tracker",
-        fields=["name", "payment_requester", "payment_request", "total_amount_remaining"],
-        filters={}
-    )
-
-    for prt in prts:
-        # Determine which field to use based on reference type
-        if reference_type == "Payment Request":
-            reference_name = prt.payment_request
-            pe_filters = {"payment_request": prt.payment_request}
-        else:
-            reference_name = prt.payment_requester
-            pe_filters = {"custom_payment_reference_name": reference_name}
-
-        if not reference_name:
-            continue
-
-        # Fetch Payment Entries linked to the selected reference type
-        # pe_filters = {"custom_payment_reference_name": reference_name}  # 🔸 Use dynamic reference
-        pes = frappe.get_all(
-            "Payment Entry",
-            filters=pe_filters,
-            fields=["name", "posting_date", "paid_amount"]
-        )
-
-        if not pes:
-            # Only add rows without posting_date if no date filters are applied
-            if not (filters.get("from_date") or filters.get("to_date")):
-                grand_total = (prt.total_amount_remaining or 0)
-                row = {
-                    "payment_request": reference_name,
-                    "prt_id": prt.name,
-                    "payment_entry": None,
-                    "posting_date": None,
-                    "paid_amount": 0,
-                    "unpaid_amount": prt.total_amount_remaining or 0,
-                    "grand_total": grand_total,
-                }
-                if match_filters(row, filters):
-                    data.append(row)
-            continue
-
-        for pe in pes:
-            grand_total = (pe.paid_amount or 0) + (prt.total_amount_remaining or 0)
-            row = {
-                "payment_request": reference_name,
-                "prt_id": prt.name,
-                "payment_entry": pe.name,
-                "posting_date": pe.posting_date,
-                "paid_amount": pe.paid_amount or 0,
-                "unpaid_amount": prt.total_amount_remaining or 0,
-                "grand_total": grand_total,
-            }
-            if match_filters(row, filters):
-                data.append(row)
-
-    return data
-
-
-def match_filters(row, filters):
-    """Apply manual filters"""
-    if filters.get("from_date") or filters.get("to_date"):
-        if not row["posting_date"]:
-            return False
-    if filters.get("from_date") and row["posting_date"]:
-        if row["posting_date"] < getdate(filters["from_date"]):
-            return False
-    if filters.get("to_date") and row["posting_date"]:
-        if row["posting_date"] > getdate(filters["to_date"]):
-            return False
-
+    if reference_type not in SYNC_SOURCES:
+        frappe.throw(_("Invalid Reference Type {0}").format(reference_type))
+
+    tracker_field = SYNC_SOURCES[reference_type]["tracker_field"]
+    payment_entry_field = SYNC_SOURCES[reference_type]["payment_entry_field"]
+
+    conditions = [f"prt.`{tracker_field}` IS NOT NULL", f"prt.`{tracker_field}` != ''"]
+    values = {}
+
+    # with a date range only trackers with a Payment Entry in it are shown, so the
+    # entries in range drive the join
+    has_dates = bool(filters.get("from_date") or filters.get("to_date"))
+    if filters.get("from_date"):
+        conditions.append("pe.posting_date >= %(from_date)s")
+        values["from_date"] = getdate(filters["from_date"])
+    if filters.get("to_date"):
+        conditions.append("pe.posting_date <= %(to_date)s")
+        values["to_date"] = getdate(filters["to_date"])
+
+    # grand total = paid (this PE) + remaining (PRT), so "Full Paid" means nothing remaining
     if filters.get("amount_paid") == "Full Paid":
-        if row["grand_total"] != row["paid_amount"]:
-            return False
+        conditions.append("IFNULL(prt.total_amount_remaining, 0) = 0")
     elif filters.get("amount_paid") == "Unpaid":
-        if row["paid_amount"] != 0:
-            return False
-
-    return True
+        conditions.append("IFNULL(pe.paid_amount, 0) = 0")
+
+    return frappe.db.sql(
+        f"""
+        SELECT
+            prt.`{tracker_field}` AS payment_request,
+            prt.name AS prt_id,
+            pe.name AS payment_entry,
+            pe.posting_date,
+            IFNULL(pe.paid_amount, 0) AS paid_amount,
+            IFNULL(prt.total_amount_remaining, 0) AS unpaid_amount,
+            IFNULL(pe.paid_amount, 0) + IFNULL(prt.total_amount_remaining, 0) AS grand_total
+        FROM `tabPayment Request Tracker` prt
+        {"INNER" if has_dates else "LEFT"} JOIN `tabPayment Entry` pe
+        ON pe.`{payment_entry_field}` = prt.`{tracker_field}`
+        WHERE {" AND ".join(conditions)}
+        ORDER BY prt.modified DESC, pe.modified DESC
+        """,
+        values,
+        as_dict=True,
+    )
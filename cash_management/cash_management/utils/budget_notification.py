@@ -0,0 +1,115 @@
+"""
+Budget notification digests for the Payment Management Budget page.
+
+Recipients are resolved with one join from the enabled roles of Cash Management Budget
+to their enabled users and kept in Redis until Cash Management Budget or a User changes
+(roles are child rows saved through their User), so finding who gets budget alerts is a
+single cache lookup. The digest (open requests, budget and remaining amounts per kind of
+request) comes from one aggregate query over the Cash Management read model and is
+shared by all recipients; the mails are sent from a background job.
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import fmt_money, get_url
+
+DIGEST_TEMPLATE = "cash_management_budget_digest"
+RECIPIENTS_CACHE_KEY = "cash_management:budget_recipients"
+
+
+def get_budget_recipients():
+    """Enabled users holding a role enabled for notification in Cash Management Budget."""
+    return frappe.cache.get_value(RECIPIENTS_CACHE_KEY, generator=resolve_budget_recipients)
+
+
+def clear_budget_recipients(doc=None, method=None):
+    frappe.cache.delete_value(RECIPIENTS_CACHE_KEY)
+
+
+def resolve_budget_recipients():
+    return frappe.db.sql(
+        """
+        SELECT DISTINCT u.name AS user, u.full_name
+        FROM `tabCash Management Budget Details` cmbd
+        INNER JOIN `tabHas Role` hr
+        ON hr.role = cmbd.role AND hr.parenttype = 'User'
+        INNER JOIN `tabUser` u
+        ON u.name = hr.parent
+        WHERE cmbd.parenttype = 'Cash Management Budget'
+        AND cmbd.parentfield = 'role_permission_for_notification'
+        AND cmbd.enable = 1
+        AND u.enabled = 1
+        ORDER BY u.name
+        """,
+        as_dict=True,
+    )
+
+
+def get_budget_digest():
+    """Open requests with their budget and remaining amounts, per kind of request."""
+    totals = frappe.db.sql(
+        """
+        SELECT
+            CASE
+                WHEN t.source_doctype = 'Payment Requester' THEN 'Other Payment Requests'
+                WHEN t.payment_request_type = 'Inward' THEN 'Sales Order'
+                ELSE 'Purchase Order'
+            END AS label,
+            COUNT(*) AS open_requests,
+            COALESCE(SUM(t.budget), 0) AS budget,
+            COALESCE(SUM(t.outstanding), 0) AS remaining,
+            COALESCE(SUM(CASE WHEN IFNULL(t.budget, 0) = 0 THEN t.outstanding ELSE 0 END), 0) AS unbudgeted
+        FROM `tabCash Management` t
+        WHERE t.outstanding > 0
+        AND IFNULL(t.request_docstatus, 0) < 2
+        GROUP BY label
+        ORDER BY label
+        """,
+        as_dict=True,
+    )
+
+    return {
+        "rows": [
+            {
+                "label": _(row.label),
+                "open_requests": row.open_requests,
+                "budget": fmt_money(row.budget),
+                "remaining": fmt_money(row.remaining),
+                "unbudgeted": fmt_money(row.unbudgeted),
+            }
+            for row in totals
+        ],
+        "page_url": get_url("/app/payment-management-budget"),
+    }
+
+
+def enqueue_budget_notification():
+    """Queue the digest for every recipient and return the number of recipients."""
+    recipients = get_budget_recipients()
+    if not recipients:
+        return 0
+
+    frappe.enqueue(
+        send_budget_digests,
+        queue="long",
+        timeout=1800,
+        recipients=recipients,
+        digest=get_budget_digest(),
+    )
+    return len(recipients)
+
+
+def send_budget_digests(recipients, digest):
+    subject = _("Cash Management Budget Notification")
+    for recipient in recipients:
+        try:
+            frappe.sendmail(
+                recipients=[recipient["user"]],
+                subject=subject,
+                template=DIGEST_TEMPLATE,
+                args={"full_name": recipient.get("full_name") or recipient["user"], "digest": digest},
+                reference_doctype="Cash Management Budget",
+                reference_name="Cash Management Budget",
+            )
+        except Exception as e:
+            frappe.log_error(f"Failed to send notification to {recipient['user']}: {e!s}")
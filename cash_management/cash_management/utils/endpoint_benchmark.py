@@ -0,0 +1,503 @@
+"""
+Synthetic data and endpoint timings for the cash_management app.
+
+`generate_data` writes Purchase Orders with payment schedules, Payment Requests,
+Payment Requesters and Payment Entries (with their Payment Entry References) straight
+into their tables with `bulk_insert`, all named with the BENCH_PREFIX so they can be
+removed again. Trackers are created from that data by the two sync jobs, which are
+timed as part of the run, together with every whitelisted method of the Payment
+Management and Payment Management Budget pages and both reports.
+
+Run it on a scratch site with
+`bench --site <site> benchmark-cash-management --scale 100k --output bench.json` and
+compare the JSON of two runs to spot regressions.
+"""
+
+import json
+import random
+import time
+
+import frappe
+from frappe.utils import add_days, flt, getdate, now, nowdate
+
+from cash_management.cash_management.doctype.payment_reference_rollup.payment_reference_rollup import (
+    update_reference_rollups,
+)
+from cash_management.cash_management.doctype.payment_request_tracker import payment_request_tracker
+from cash_management.cash_management.doctype.payment_search_trigram.payment_search_trigram import (
+    index_documents,
+)
+from cash_management.cash_management.page.payment_management import payment_management
+from cash_management.cash_management.page.payment_management_budget import payment_management_budget
+from cash_management.cash_management.report.payment_request_report_with_request_tracker import (
+    payment_request_report_with_request_tracker as request_report,
+)
+from cash_management.cash_management.report.payment_requester_report_with_request_tracker import (
+    payment_requester_report_with_request_tracker as requester_report,
+)
+from cash_management.cash_management.utils import payment_list, report_cache
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+BENCH_PREFIX = "CMBENCH-"
+CHUNK_SIZE = 5000
+
+# doctype: column that carries the BENCH_PREFIX
+GENERATED_TABLES = {
+    "Payment Entry Reference": "parent",
+    "Payment Entry": "name",
+    "Payment Schedule": "parent",
+    "Purchase Order": "name",
+    "Payment Request": "name",
+    "Payment Requester": "name",
+}
+
+# rows derived from the generated documents
+BENCH_TRACKER = "IFNULL(payment_request, payment_requester) LIKE %(prefix)s"
+DERIVED_TABLES = {
+    "Payment Request Details": (
+        f"parent IN (SELECT name FROM `tabPayment Request Tracker` WHERE {BENCH_TRACKER})"
+    ),
+    "Payment Request Tracker": BENCH_TRACKER,
+    "Cash Management": "source_name LIKE %(prefix)s",
+    "Payment Reference Rollup": "reference_name LIKE %(prefix)s",
+    "Payment Search Trigram": "source_name LIKE %(prefix)s",
+}
+
+DOCUMENT_COLUMNS = ["name", "creation", "modified", "owner", "modified_by", "docstatus"]
+CHILD_COLUMNS = ["parent", "parenttype", "parentfield", "idx"]
+
+WATERMARK_FIELDS = ["payment_request_sync_watermark", "payment_requester_sync_watermark"]
+
+
+def run_endpoint_benchmark(scale="10k", repeat=5, seed=42, keep_data=False):
+    """Generate `scale` rows, time every endpoint `repeat` times and return the results."""
+    rows = SCALES[scale] if scale in SCALES else int(scale)
+    watermarks = {
+        field: frappe.db.get_single_value("Cash Management Settings", field) for field in WATERMARK_FIELDS
+    }
+
+    result = {"scale": scale, "rows": rows, "repeat": repeat, "started": now()}
+    try:
+        delete_generated_data()
+        start = time.perf_counter()
+        result["generated"] = generate_data(rows, random.Random(seed))
+        result["generate_seconds"] = round(time.perf_counter() - start, 3)
+
+        result["timings"] = {}
+        result["skipped"] = {}
+        # the sync jobs create the trackers the endpoints read, so they run first
+        for get_cases in (get_sync_cases, get_endpoint_cases):
+            for label, call, setup in get_cases():
+                if call is None:
+                    result["skipped"][label] = setup
+                    continue
+                result["timings"][label] = time_call(call, repeat, setup)
+    finally:
+        if not keep_data:
+            delete_generated_data()
+        for field, value in watermarks.items():
+            frappe.db.set_single_value("Cash Management Settings", field, value)
+        frappe.db.commit()
+
+    return result
+
+
+def time_call(call, repeat, setup=None):
+    """Wall time of `call` in milliseconds over `repeat` runs."""
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "mean_ms": round(sum(timings) / len(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+def get_sync_cases():
+    cases = []
+    for function in ("sync_payment_request_trackers", "sync_payment_requester_trackers"):
+        sync = getattr(payment_request_tracker, function)
+        cases += [
+            (f"{function} (full)", lambda sync=sync: sync(full=True), None),
+            (f"{function} (incremental)", sync, None),
+        ]
+    return cases
+
+
+def get_endpoint_cases():
+    """(label, call, setup) per endpoint; a skipped endpoint has call None and the reason as setup."""
+    trackers = frappe.get_all(
+        "Payment Request Tracker",
+        filters={"payment_request": ["like", f"{BENCH_PREFIX}%"]},
+        pluck="name",
+        order_by="name",
+        limit=500,
+    )
+    supplier = frappe.db.get_value("Payment Request", {"name": ["like", f"{BENCH_PREFIX}%"]}, "party_name")
+    month = {"from_date": str(add_days(getdate(), -30)), "to_date": nowdate()}
+    page = {"limit": 100}
+    first_page = payment_list.get_payment_request_entries({}, 100)
+
+    cases = []
+    for module_name, module in (
+        ("payment_management", payment_management),
+        ("payment_management_budget", payment_management_budget),
+    ):
+        filter_sets = {
+            "first page": {},
+            "month": month,
+            "supplier search": {"supplier": supplier},
+            "request search": {"payment_request": f"{BENCH_PREFIX}PR-00001"},
+        }
+        for name, filters in filter_sets.items():
+            cases += [
+                (
+                    f"{module_name}.get_payment_request_entries ({name})",
+                    lambda f=filters, module=module: module.get_payment_request_entries(
+                        json.dumps(f), **page
+                    ),
+                    None,
+                ),
+                (
+                    f"{module_name}.get_payment_requester_entries ({name})",
+                    lambda f=filters, module=module: module.get_payment_requester_entries(
+                        json.dumps(f), **page
+                    ),
+                    None,
+                ),
+                (
+                    f"{module_name}.get_payment_request_inward_entries ({name})",
+                    lambda f=filters, module=module: module.get_payment_request_inward_entries(
+                        filters=json.dumps(f), **page
+                    ),
+                    None,
+                ),
+            ]
+        cases += [
+            (
+                f"{module_name}.get_payment_request_entries (second page)",
+                lambda module=module: module.get_payment_request_entries(
+                    "{}", 100, first_page["next_cursor"]
+                ),
+                None,
+            ),
+            # the streamed response re-initialises the site, so walk the same pages directly
+            (
+                f"{module_name}.stream_entries (month)",
+                lambda: walk_stream_pages(payment_list.get_payment_request_entries, month),
+                None,
+            ),
+            (
+                f"{module_name}.get_tracker_child_table",
+                lambda module=module: module.get_tracker_child_table(trackers[0]),
+                None,
+            ),
+            (
+                f"{module_name}.get_tracker_child_tables (100)",
+                lambda module=module: module.get_tracker_child_tables(json.dumps(trackers[:100])),
+                None,
+            ),
+            (
+                f"{module_name}.update_tracker_child_table (no postings)",
+                lambda module=module: module.update_tracker_child_table(trackers[1], "[]"),
+                None,
+            ),
+            (
+                f"{module_name}.update_paid_amount",
+                None,
+                "saves a real Payment Entry, which the generated rows are not",
+            ),
+        ]
+
+    cases += [
+        (
+            "payment_management_budget.update_tracker_budget",
+            lambda: payment_management_budget.update_tracker_budget(trackers[2], 1000),
+            None,
+        ),
+        (
+            "payment_management_budget.update_tracker_budgets (500)",
+            lambda: payment_management_budget.update_tracker_budgets(
+                json.dumps([{"tracker": tracker, "budget": 1000} for tracker in trackers])
+            ),
+            None,
+        ),
+        (
+            "payment_management_budget.process_email_notification",
+            None,
+            "sends mail to the notification recipients",
+        ),
+        (
+            "Payment Request Report with Request Tracker (month)",
+            lambda: request_report.execute({"reference_type": "Payment Request", **month}),
+            None,
+        ),
+        (
+            "Payment Request Report with Request Tracker (all, full paid)",
+            lambda: request_report.execute({"reference_type": "Payment Request", "amount_paid": "Full Paid"}),
+            None,
+        ),
+        (
+            "Payment Requester Report with Request Tracker (month, cold)",
+            lambda: requester_report.execute(dict(month)),
+            lambda: frappe.cache.delete_keys(report_cache.CACHE_KEY.format("")),
+        ),
+        (
+            "Payment Requester Report with Request Tracker (month, cached)",
+            lambda: requester_report.execute(dict(month)),
+            None,
+        ),
+    ]
+    return cases
+
+
+def walk_stream_pages(get_entries, filters):
+    cursor = None
+    while True:
+        page = get_entries(filters, 250, cursor)
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+
+def generate_data(rows, rng):
+    """Insert `rows` Payment Requests and Payment Requesters with their references and payments."""
+    company = frappe.defaults.get_global_default("company") or frappe.db.get_value("Company", {}, "name")
+    suppliers = get_parties("Supplier", "supplier_name")
+    customers = get_parties("Customer", "customer_name")
+    today = getdate()
+    purchase_orders = max(1, rows // 4)
+
+    counts = dict.fromkeys(GENERATED_TABLES, 0)
+    for start in range(0, purchase_orders, CHUNK_SIZE):
+        chunk = range(start, min(purchase_orders, start + CHUNK_SIZE))
+        counts["Purchase Order"] += insert_purchase_orders(chunk, company, suppliers, today, rng)
+        counts["Payment Schedule"] = counts["Purchase Order"] * 2
+        frappe.db.commit()
+
+    for start in range(0, rows, CHUNK_SIZE):
+        chunk = range(start, min(rows, start + CHUNK_SIZE))
+        for source_doctype in ("Payment Request", "Payment Requester"):
+            sources = build_sources(
+                source_doctype, chunk, company, suppliers, customers, purchase_orders, today, rng
+            )
+            counts[source_doctype] += len(sources)
+            entries, references = build_payment_entries(source_doctype, sources, company, rng)
+            counts["Payment Entry"] += len(entries)
+            counts["Payment Entry Reference"] += len(references)
+            insert_sources(source_doctype, sources)
+            insert_payment_entries(entries, references)
+            index_documents(source_doctype, sources)
+        frappe.db.commit()
+
+    for start in range(0, purchase_orders, CHUNK_SIZE):
+        chunk = range(start, min(purchase_orders, start + CHUNK_SIZE))
+        update_reference_rollups("Purchase Order", [bench_name("PO", i) for i in chunk])
+        frappe.db.commit()
+
+    return counts
+
+
+def bench_name(kind, i):
+    return f"{BENCH_PREFIX}{kind}-{i:07d}"
+
+
+def get_parties(doctype, name_field, count=500):
+    parties = frappe.get_all(
+        doctype, fields=["name", f"{name_field} as party_name"], limit=count, as_list=True
+    )
+    if not parties:
+        parties = [(f"{BENCH_PREFIX}{doctype}-{i:04d}",) * 2 for i in range(count)]
+    return parties
+
+
+def insert_purchase_orders(indexes, company, suppliers, today, rng):
+    timestamp = now()
+    user = frappe.session.user
+    orders = []
+    schedules = []
+    for i in indexes:
+        name = bench_name("PO", i)
+        grand_total = rng.randint(1_000, 1_000_000)
+        transaction_date = add_days(today, -rng.randint(0, 365))
+        orders.append(
+            [
+                *(name, timestamp, timestamp, user, user, 1),
+                rng.choice(suppliers)[0],
+                company,
+                transaction_date,
+                add_days(transaction_date, 30),
+                grand_total,
+                grand_total,
+                "To Receive and Bill",
+            ]
+        )
+        for idx, (portion, description) in enumerate(((50, "Advance Payment"), (50, "Upon delivery")), 1):
+            schedules.append(
+                [
+                    *(f"{name}-{idx}", timestamp, timestamp, user, user, 1),
+                    *(name, "Purchase Order", "payment_schedule", idx),
+                    description,
+                    add_days(transaction_date, 30 * idx),
+                    portion,
+                    grand_total * portion / 100,
+                ]
+            )
+
+    frappe.db.bulk_insert(
+        "Purchase Order",
+        [
+            *DOCUMENT_COLUMNS,
+            "supplier",
+            "company",
+            "transaction_date",
+            "schedule_date",
+            "grand_total",
+            "base_grand_total",
+            "status",
+        ],
+        orders,
+    )
+    frappe.db.bulk_insert(
+        "Payment Schedule",
+        [
+            *DOCUMENT_COLUMNS,
+            *CHILD_COLUMNS,
+            "description",
+            "due_date",
+            "invoice_portion",
+            "payment_amount",
+        ],
+        schedules,
+    )
+    return len(orders)
+
+
+def build_sources(source_doctype, indexes, company, suppliers, customers, purchase_orders, today, rng):
+    kind = "PR" if source_doctype == "Payment Request" else "PRQ"
+    sources = []
+    for i in indexes:
+        inward = rng.random() < 0.2
+        party, party_name = rng.choice(customers if inward else suppliers)
+        purchase_order = None if inward else bench_name("PO", rng.randrange(purchase_orders))
+        sources.append(
+            frappe._dict(
+                name=bench_name(kind, i),
+                payment_request_type="Inward" if inward else "Outward",
+                transaction_date=add_days(today, -rng.randint(0, 365)),
+                company=company,
+                party_type="Customer" if inward else "Supplier",
+                party=party,
+                party_name=party_name,
+                reference_doctype=None if inward else "Purchase Order",
+                reference_name=purchase_order,
+                grand_total=rng.randint(100, 250_000),
+            )
+        )
+    return sources
+
+
+def insert_sources(source_doctype, sources):
+    timestamp = now()
+    user = frappe.session.user
+    fields = [
+        "payment_request_type",
+        "transaction_date",
+        "company",
+        "party_type",
+        "party",
+        "party_name",
+        "reference_doctype",
+        "reference_name",
+        "grand_total",
+    ]
+    extra = ["status"] if source_doctype == "Payment Request" else []
+    frappe.db.bulk_insert(
+        source_doctype,
+        [*DOCUMENT_COLUMNS, *fields, *extra],
+        [
+            [source.name, timestamp, timestamp, user, user, 1]
+            + [source[field] for field in fields]
+            + (["Initiated"] if extra else [])
+            for source in sources
+        ],
+    )
+
+
+def build_payment_entries(source_doctype, sources, company, rng):
+    """Zero to three partial payments per source, a few of them drafts or cancelled."""
+    link_field = "reference_no" if source_doctype == "Payment Request" else "custom_payment_reference_name"
+    entries = []
+    references = []
+    for source in sources:
+        remaining = flt(source.grand_total)
+        for n in range(rng.choice((0, 1, 1, 2, 3))):
+            paid_amount = round(remaining * rng.choice((0.25, 0.5, 1)), 2)
+            remaining -= paid_amount
+            name = f"{source.name}-PE{n}"
+            entries.append(
+                {
+                    "name": name,
+                    "docstatus": rng.choice((1, 1, 1, 1, 0, 2)),
+                    "payment_type": "Receive" if source.payment_request_type == "Inward" else "Pay",
+                    "posting_date": add_days(source.transaction_date, rng.randint(0, 60)),
+                    "company": company,
+                    "party_type": source.party_type,
+                    "party": source.party,
+                    "paid_amount": paid_amount,
+                    "received_amount": paid_amount,
+                    "reference_no": source.name if link_field == "reference_no" else None,
+                    "custom_payment_reference_name": source.name if link_field != "reference_no" else None,
+                }
+            )
+            if source.reference_name:
+                references.append(
+                    (f"{name}-1", name, source.reference_doctype, source.reference_name, paid_amount)
+                )
+    return entries, references
+
+
+def insert_payment_entries(entries, references):
+    if not entries:
+        return
+
+    timestamp = now()
+    user = frappe.session.user
+    fields = list(entries[0])
+    # custom_payment_reference_name is a Custom Field and may not exist on every site
+    if not frappe.db.has_column("Payment Entry", "custom_payment_reference_name"):
+        fields.remove("custom_payment_reference_name")
+    frappe.db.bulk_insert(
+        "Payment Entry",
+        ["creation", "modified", "owner", "modified_by", *fields],
+        [[timestamp, timestamp, user, user] + [entry[field] for field in fields] for entry in entries],
+    )
+    frappe.db.bulk_insert(
+        "Payment Entry Reference",
+        [*DOCUMENT_COLUMNS, *CHILD_COLUMNS, "reference_doctype", "reference_name", "allocated_amount"],
+        [
+            [
+                *(name, timestamp, timestamp, user, user, 1),
+                *(parent, "Payment Entry", "references", 1),
+                reference_doctype,
+                reference_name,
+                amount,
+            ]
+            for name, parent, reference_doctype, reference_name, amount in references
+        ],
+    )
+
+
+def delete_generated_data():
+    """Remove everything generated by `generate_data` and derived from it."""
+    values = {"prefix": f"{BENCH_PREFIX}%"}
+    for doctype, condition in DERIVED_TABLES.items():
+        frappe.db.sql(f"DELETE FROM `tab{doctype}` WHERE {condition}", values)
+    for doctype, column in GENERATED_TABLES.items():
+        frappe.db.sql(f"DELETE FROM `tab{doctype}` WHERE `{column}` LIKE %(prefix)s", values)
+    frappe.db.commit()
@@ -0,0 +1,176 @@
+"""
+Before / after timings for the lookup indexes added by `add_payment_lookup_indexes`.
+
+The benchmark never touches real documents: it builds scratch copies of the relevant
+columns of Payment Entry, Payment Request and Payment Request Tracker, fills them with
+generated rows, times the hot lookups, adds the indexes and times them again. Run it
+with `bench --site <site> benchmark-payment-indexes --rows 100000`.
+"""
+
+import random
+import time
+
+import frappe
+
+ENTRY_TABLE = "__cash_management_bench_entry"
+REQUEST_TABLE = "__cash_management_bench_request"
+TRACKER_TABLE = "__cash_management_bench_tracker"
+
+TABLES = {
+    ENTRY_TABLE: """
+        name VARCHAR(140) NOT NULL PRIMARY KEY,
+        docstatus INT NOT NULL DEFAULT 0,
+        reference_no VARCHAR(140),
+        custom_payment_reference_name VARCHAR(140),
+        paid_amount DECIMAL(21, 9) NOT NULL DEFAULT 0
+    """,
+    REQUEST_TABLE: """
+        name VARCHAR(140) NOT NULL PRIMARY KEY,
+        reference_doctype VARCHAR(140),
+        reference_name VARCHAR(140),
+        transaction_date DATE
+    """,
+    TRACKER_TABLE: """
+        name VARCHAR(140) NOT NULL PRIMARY KEY,
+        payment_request VARCHAR(140),
+        payment_requester VARCHAR(140)
+    """,
+}
+
+# label: (table, index columns, query, key kind)
+QUERIES = {
+    "tracker by payment_request": (
+        TRACKER_TABLE,
+        ["payment_request"],
+        f"SELECT name FROM `{TRACKER_TABLE}` WHERE payment_request = %(key)s",
+        "request",
+    ),
+    "tracker by payment_requester": (
+        TRACKER_TABLE,
+        ["payment_requester"],
+        f"SELECT name FROM `{TRACKER_TABLE}` WHERE payment_requester = %(key)s",
+        "requester",
+    ),
+    "payment entry by reference_no": (
+        ENTRY_TABLE,
+        ["reference_no"],
+        f"SELECT name FROM `{ENTRY_TABLE}` WHERE reference_no = %(key)s",
+        "request",
+    ),
+    "payment entry by custom_payment_reference_name": (
+        ENTRY_TABLE,
+        ["custom_payment_reference_name"],
+        f"SELECT name FROM `{ENTRY_TABLE}` WHERE custom_payment_reference_name = %(key)s",
+        "requester",
+    ),
+    "submitted payment total by reference_no": (
+        ENTRY_TABLE,
+        ["docstatus", "reference_no"],
+        f"SELECT SUM(paid_amount) FROM `{ENTRY_TABLE}` WHERE docstatus = 1 AND reference_no = %(key)s",
+        "request",
+    ),
+    "requests by reference and date": (
+        REQUEST_TABLE,
+        ["reference_doctype", "reference_name", "transaction_date"],
+        f"""SELECT name FROM `{REQUEST_TABLE}`
+        WHERE reference_doctype = 'Purchase Order' AND reference_name = %(key)s
+        ORDER BY transaction_date DESC""",
+        "purchase_order",
+    ),
+}
+
+
+def run_index_benchmark(rows=100000, repeat=50, seed=42):
+    """Return {rows, repeat, queries: {label: {before_ms, after_ms, speedup}}}."""
+    rng = random.Random(seed)
+    keys = {
+        "request": [f"ACC-PRQ-BENCH-{i:07d}" for i in range(rows)],
+        "requester": [f"PRQR-BENCH-{i:07d}" for i in range(rows)],
+        "purchase_order": [f"PUR-ORD-BENCH-{i:07d}" for i in range(max(1, rows // 4))],
+    }
+    samples = {kind: [rng.choice(values) for _ in range(repeat)] for kind, values in keys.items()}
+
+    try:
+        create_tables()
+        fill_tables(rows, keys, rng)
+
+        result = {}
+        for label, (_table, _columns, query, kind) in QUERIES.items():
+            result[label] = {"before_ms": time_query(query, samples[kind])}
+
+        for table, columns in {(table, tuple(columns)) for table, columns, query, kind in QUERIES.values()}:
+            frappe.db.sql_ddl(f"ALTER TABLE `{table}` ADD INDEX ({', '.join(columns)})")
+
+        for label, (_table, _columns, query, kind) in QUERIES.items():
+            timing = result[label]
+            timing["after_ms"] = time_query(query, samples[kind])
+            timing["speedup"] = round(timing["before_ms"] / timing["after_ms"], 1) if timing["after_ms"] else None
+    finally:
+        drop_tables()
+
+    return {"rows": rows, "repeat": repeat, "queries": result}
+
+
+def create_tables():
+    drop_tables()
+    for table, columns in TABLES.items():
+        frappe.db.sql_ddl(f"CREATE TABLE `{table}` ({columns}) ENGINE=InnoDB")
+
+
+def drop_tables():
+    for table in TABLES:
+        frappe.db.sql_ddl(f"DROP TABLE IF EXISTS `{table}`")
+
+
+def fill_tables(rows, keys, rng, chunk_size=5000):
+    for start in range(0, rows, chunk_size):
+        stop = min(rows, start + chunk_size)
+        insert(
+            ENTRY_TABLE,
+            ["name", "docstatus", "reference_no", "custom_payment_reference_name", "paid_amount"],
+            [
+                (
+                    f"ACC-PAY-BENCH-{i:07d}",
+                    rng.choice((0, 1, 1, 1, 2)),
+                    rng.choice(keys["request"]),
+                    rng.choice(keys["requester"]),
+                    rng.randint(100, 100000),
+                )
+                for i in range(start, stop)
+            ],
+        )
+        insert(
+            REQUEST_TABLE,
+            ["name", "reference_doctype", "reference_name", "transaction_date"],
+            [
+                (
+                    keys["request"][i],
+                    "Purchase Order",
+                    rng.choice(keys["purchase_order"]),
+                    f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                )
+                for i in range(start, stop)
+            ],
+        )
+        insert(
+            TRACKER_TABLE,
+            ["name", "payment_request", "payment_requester"],
+            [(f"TRK-BENCH-{i:07d}", keys["request"][i], keys["requester"][i]) for i in range(start, stop)],
+        )
+        frappe.db.commit()
+
+
+def insert(table, columns, values):
+    placeholders = ", ".join(["(" + ", ".join(["%s"] * len(columns)) + ")"] * len(values))
+    frappe.db.sql(
+        f"INSERT INTO `{table}` ({', '.join(columns)}) VALUES {placeholders}",
+        [value for row in values for value in row],
+    )
+
+
+def time_query(query, keys):
+    """Mean wall time per execution in milliseconds."""
+    start = time.perf_counter()
+    for key in keys:
+        frappe.db.sql(query, {"key": key})
+    return round((time.perf_counter() - start) * 1000 / len(keys), 3)
@@ -0,0 +1,54 @@
+"""
+Supplier / Customer filter resolution for the Payment Management list endpoints.
+
+A party filter is matched against a cached map of party ID to party name per party type
+and turned into the set of matching party IDs, which the list query applies as an
+`IN` clause on the indexed `party` column of the read model. The map is dropped by the
+Supplier / Customer doc_events below whenever a party is added, renamed or deleted.
+"""
+
+import frappe
+
+PARTY_NAME_FIELDS = {"Supplier": "supplier_name", "Customer": "customer_name"}
+CACHE_KEY = "cash_management:party_names:{0}"
+CACHE_EXPIRY = 6 * 60 * 60
+
+
+def resolve_party_ids(party_type, term):
+    """IDs of parties of `party_type` whose ID or name contains `term` (case-insensitive)."""
+    term = (term or "").strip().lower()
+    if not term:
+        return []
+
+    return [
+        party
+        for party, party_name in get_party_name_map(party_type).items()
+        if term in party.lower() or term in (party_name or "").lower()
+    ]
+
+
+def get_party_name_map(party_type):
+    key = CACHE_KEY.format(party_type)
+    party_names = frappe.cache.get_value(key, expires=True)
+    if party_names is None:
+        party_names = build_party_name_map(party_type)
+        frappe.cache.set_value(key, party_names, expires_in_sec=CACHE_EXPIRY)
+    return party_names
+
+
+def build_party_name_map(party_type):
+    return dict(
+        frappe.get_all(
+            party_type,
+            fields=["name", PARTY_NAME_FIELDS[party_type]],
+            as_list=True,
+            order_by="name",
+        )
+    )
+
+
+def clear_party_name_map(doc, method=None):
+    """doc_events hook for Supplier / Customer."""
+    if method == "on_update" and not doc.has_value_changed(PARTY_NAME_FIELDS[doc.doctype]):
+        return
+    frappe.cache.delete_value(CACHE_KEY.format(doc.doctype))
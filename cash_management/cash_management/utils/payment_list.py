@@ -0,0 +1,563 @@
+"""
+Shared data access for the Payment Management and Payment Management Budget pages.
+
+The list endpoints read the `Cash Management` read model (see its controller), which
+holds one pre-joined row per Payment Request / Payment Requester, with a single query
+on its (source_doctype, transaction_date, source_name) index. When a `limit` is passed
+that query is paged with a keyset cursor on (transaction_date, source_name), not OFFSET,
+so later pages cost the same as the first. Request name and reference name searches
+are resolved to candidate names through the `Payment Search Trigram` index first.
+
+The `build_*_rows` functions below compute those rows from the source documents. They
+enrich in bulk: trackers, Payment Entry sums and Purchase Order headers are each loaded
+with one grouped query for the whole set and joined in memory, so the number of queries
+does not grow with the number of rows. Purchase Order grand total and paid total come
+from the `Payment Reference Rollup` table and payment terms from the summary cache in
+`payment_terms`.
+"""
+
+import base64
+import json
+from collections import defaultdict
+
+import frappe
+from frappe import _
+from frappe.utils import cint, flt, getdate
+from werkzeug.wrappers import Response
+
+from cash_management.cash_management.doctype.payment_reference_rollup.payment_reference_rollup import (
+    get_reference_rollups,
+)
+from cash_management.cash_management.doctype.payment_search_trigram.payment_search_trigram import (
+    search_source_names,
+)
+from cash_management.cash_management.utils.party_search import resolve_party_ids
+from cash_management.cash_management.utils.payment_terms import get_purchase_order_payment_terms
+from cash_management.cash_management.utils.perf_log import CallMetrics
+
+PAYMENT_REQUEST_FIELDS = [
+    "name",
+    "grand_total",
+    "reference_doctype",
+    "reference_name",
+    "party_type",
+    "party",
+    "party_name",
+    "transaction_date",
+]
+
+TRACKER_FIELDS = ["name", "payment_entry", "total_amount_paid", "total_amount_remaining", "budget"]
+
+READ_MODEL_FIELDS = [
+    "source_doctype",
+    "source_name",
+    "transaction_date",
+    "status",
+    "party_type",
+    "party",
+    "party_name",
+    "reference_doctype",
+    "reference_name",
+    "purchase_order",
+    "grand_total",
+    "payment_terms_summary",
+    "po_grand_total",
+    "po_remaining",
+    "tracker",
+    "payment_entry_id",
+    "budget",
+    "paid_amount",
+    "outstanding",
+]
+
+MAX_PAGE_LENGTH = 500
+STREAM_CHUNK_SIZE = 250
+
+INWARD_REMAINING = "(CASE WHEN t.status = 'Paid' THEN 0 ELSE t.outstanding END)"
+
+
+def get_payment_request_entries(filters, limit=None, cursor=None):
+    """Outward Payment Requests with tracker, payment and Purchase Order details."""
+    conditions, values = get_common_conditions(filters, "Payment Request")
+
+    add_party_condition(conditions, values, "Supplier", filters.get("supplier"))
+
+    if filters.get("reference_name") and not filters.get("reference_doctype"):
+        # reference name alone is a Purchase Order search, for backward compatibility
+        conditions.append("t.reference_doctype = 'Purchase Order'")
+
+    add_paid_status_condition(conditions, filters, "t.outstanding")
+
+    page = fetch_page(conditions, values, limit, cursor)
+    page["rows"] = [get_outward_row(row) for row in page["rows"]]
+    return page if limit else page["rows"]
+
+
+def get_payment_requester_entries(filters, limit=None, cursor=None):
+    """Payment Requesters with tracker details and Invoice released Memo payment terms."""
+    conditions, values = get_common_conditions(filters, "Payment Requester")
+    add_paid_status_condition(conditions, filters, "t.outstanding")
+
+    page = fetch_page(conditions, values, limit, cursor)
+    page["rows"] = [get_outward_row(row) for row in page["rows"]]
+    return page if limit else page["rows"]
+
+
+def get_payment_request_inward_entries(filters, limit=None, cursor=None):
+    """Submitted inward Payment Requests (customer receipts) with tracker and payment details."""
+    conditions, values = get_common_conditions(filters, "Payment Request")
+    conditions.append("t.payment_request_type = 'Inward'")
+    conditions.append("t.request_docstatus = 1")
+
+    # inward means customer
+    add_party_condition(conditions, values, "Customer", filters.get("supplier"))
+
+    add_paid_status_condition(conditions, filters, INWARD_REMAINING)
+
+    page = fetch_page(conditions, values, limit, cursor)
+    page["rows"] = [get_inward_row(row) for row in page["rows"]]
+    return page if limit else page["rows"]
+
+
+STREAM_LIST_TYPES = {
+    "payment_request": get_payment_request_entries,
+    "payment_requester": get_payment_requester_entries,
+    "payment_request_inward": get_payment_request_inward_entries,
+}
+
+
+def stream_entries(list_type, filters):
+    """
+    Stream a list endpoint as newline-delimited JSON, one row per line.
+
+    Rows are read and flushed a chunk of STREAM_CHUNK_SIZE at a time by walking the
+    keyset cursor, so memory use and time to first row do not depend on the number of
+    matching rows. A failure after the response has started is reported as a final
+    `{"error": ...}` line.
+    """
+    get_entries = STREAM_LIST_TYPES.get(list_type)
+    if not get_entries:
+        frappe.throw(_("Unknown list type {0}").format(list_type))
+
+    site = frappe.local.site
+    user = frappe.session.user
+
+    def generate():
+        # the request context is torn down before the body is sent
+        frappe.init(site=site)
+        frappe.connect()
+        frappe.set_user(user)
+        # the endpoint returns before any query runs, so the chunks are measured here
+        metrics = CallMetrics()
+        try:
+            cursor = None
+            while True:
+                with metrics.measure():
+                    page = get_entries(filters, STREAM_CHUNK_SIZE, cursor)
+                if page["rows"]:
+                    yield "".join(frappe.as_json(row, indent=None) + "\n" for row in page["rows"])
+
+                cursor = page["next_cursor"]
+                if not cursor:
+                    break
+        except Exception:
+            frappe.log_error(title=f"Payment Management stream failed: {list_type}")
+            yield frappe.as_json({"error": _("Loading failed, please check the Error Log.")}, indent=None) + "\n"
+        finally:
+            metrics.record(f"{__name__}.stream_entries", kwargs={"list_type": list_type, "filters": filters})
+            frappe.destroy()
+
+    response = Response(generate(), mimetype="application/x-ndjson", direct_passthrough=True)
+    response.headers["Cache-Control"] = "no-store"
+    # keep reverse proxies from buffering the whole body
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+def get_common_conditions(filters, source_doctype):
+    """SQL conditions on the read model `t` shared by all list endpoints."""
+    conditions = ["t.source_doctype = %(source_doctype)s"]
+    values = {"source_doctype": source_doctype}
+
+    for fieldname, field, column in (
+        ("payment_request", "name", "t.source_name"),
+        ("reference_name", "reference_name", "t.reference_name"),
+    ):
+        term = filters.get(fieldname)
+        if not term:
+            continue
+
+        candidates = search_source_names(source_doctype, field, term)
+        if candidates is None:
+            # term too short or too common for the trigram index
+            conditions.append(f"{column} LIKE %({fieldname})s")
+            values[fieldname] = f"%{term}%"
+        elif candidates:
+            conditions.append(f"t.source_name IN %({fieldname}_candidates)s")
+            values[f"{fieldname}_candidates"] = tuple(candidates)
+        else:
+            conditions.append("1 = 0")
+
+    if filters.get("reference_doctype"):
+        conditions.append("t.reference_doctype = %(reference_doctype)s")
+        values["reference_doctype"] = filters.get("reference_doctype")
+    if filters.get("from_date"):
+        conditions.append("t.transaction_date >= %(from_date)s")
+        values["from_date"] = filters.get("from_date")
+    if filters.get("to_date"):
+        conditions.append("t.transaction_date <= %(to_date)s")
+        values["to_date"] = filters.get("to_date")
+
+    return conditions, values
+
+
+def add_party_condition(conditions, values, party_type, term):
+    """Match `term` against party IDs and names up front, then filter on the indexed party column."""
+    if not term:
+        return
+
+    conditions.append("t.party_type = %(party_type)s")
+    values["party_type"] = party_type
+
+    parties = resolve_party_ids(party_type, term)
+    if parties:
+        conditions.append("t.party IN %(parties)s")
+        values["parties"] = tuple(parties)
+    else:
+        conditions.append("1 = 0")
+
+
+def add_paid_status_condition(conditions, filters, remaining_expr):
+    """Apply the "fully paid only" / "unpaid only" filters in SQL, so page counts stay correct."""
+    if cint(filters.get("only_fully_paid")):
+        conditions.append(f"{remaining_expr} <= 0")
+    if cint(filters.get("only_unpaid")):
+        conditions.append(f"{remaining_expr} > 0")
+
+
+def fetch_page(conditions, values, limit=None, cursor=None):
+    """
+    Fetch read model rows ordered by (transaction_date, source_name) descending.
+
+    Without `limit` every matching row is returned. With `limit` one page is returned
+    together with `next_cursor` (None on the last page) and, for the first page only,
+    `total_count` of matching rows.
+    """
+    values = dict(values)
+    page_conditions = list(conditions)
+    limit = min(cint(limit), MAX_PAGE_LENGTH) if limit else 0
+
+    if limit and cursor:
+        cursor_date, cursor_name = decode_cursor(cursor)
+        values.update({"cursor_date": cursor_date, "cursor_name": cursor_name})
+        if cursor_date is None:
+            # NULL dates sort last in descending order
+            page_conditions.append("(t.transaction_date IS NULL AND t.source_name < %(cursor_name)s)")
+        else:
+            page_conditions.append(
+                """(t.transaction_date < %(cursor_date)s
+                OR (t.transaction_date = %(cursor_date)s AND t.source_name < %(cursor_name)s)
+                OR t.transaction_date IS NULL)"""
+            )
+
+    rows = frappe.db.sql(
+        """
+        SELECT {fields}
+        FROM `tabCash Management` t
+        WHERE {conditions}
+        ORDER BY t.transaction_date DESC, t.source_name DESC
+        {limit}
+        """.format(
+            fields=", ".join(f"t.`{field}`" for field in READ_MODEL_FIELDS),
+            conditions=" AND ".join(page_conditions),
+            limit=f"LIMIT {limit + 1}" if limit else "",
+        ),
+        values,
+        as_dict=True,
+    )
+
+    page = {"rows": rows, "next_cursor": None, "total_count": None}
+    if not limit:
+        return page
+
+    if len(rows) > limit:
+        rows = page["rows"] = rows[:limit]
+        page["next_cursor"] = encode_cursor(rows[-1])
+
+    if not cursor:
+        page["total_count"] = frappe.db.sql(
+            """
+            SELECT COUNT(*)
+            FROM `tabCash Management` t
+            WHERE {conditions}
+            """.format(conditions=" AND ".join(conditions)),
+            values,
+        )[0][0]
+
+    return page
+
+
+def encode_cursor(row):
+    transaction_date = row.get("transaction_date")
+    payload = [str(transaction_date) if transaction_date else None, row.get("source_name")]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        transaction_date, name = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (getdate(transaction_date) if transaction_date else None), name
+    except Exception:
+        frappe.throw(_("Invalid page cursor"))
+
+
+def get_outward_row(row):
+    """Response row for the outward Payment Request and Payment Requester lists."""
+    supplier_name = None
+    supplier_id = None
+    if row.party_type == "Supplier":
+        supplier_id = row.party
+        supplier_name = row.party_name or row.party
+
+    has_po_figures = row.purchase_order or row.source_doctype == "Payment Requester"
+    return {
+        "payment_request": row.source_name,
+        "grand_total": row.grand_total,
+        "reference_doctype": row.reference_doctype,
+        "reference_name": row.reference_name,
+        "supplier_name": supplier_name,
+        "supplier_id": supplier_id,
+        "payment_terms": row.payment_terms_summary,
+        "transaction_date": row.transaction_date,
+        "tracker": row.tracker,
+        "payment_entry": row.payment_entry_id,
+        "total_amount_paid": row.paid_amount,
+        "total_amount_remaining": row.outstanding,
+        "po_grand_total": row.po_grand_total if has_po_figures else None,
+        "po_remaining": row.po_remaining if has_po_figures else None,
+        "budget": row.budget if row.tracker else None,
+    }
+
+
+def get_inward_row(row):
+    """Response row for the inward (customer receipt) Payment Request list."""
+    return {
+        "payment_request": row.source_name,
+        "grand_total": row.grand_total,
+        "reference_doctype": row.reference_doctype,
+        "reference_name": row.reference_name,
+        "supplier_name": row.party_name,  # Customer in this case
+        "supplier_id": row.party,
+        "payment_terms": None,
+        "transaction_date": row.transaction_date,
+        "tracker": row.tracker,
+        "payment_entry": row.payment_entry_id,
+        "total_amount_paid": row.paid_amount,
+        # If Payment Request status is "Paid", force remaining to 0
+        "total_amount_remaining": 0.0 if row.status == "Paid" else row.outstanding,
+        "po_grand_total": None,
+        "po_remaining": None,
+        "budget": row.budget if row.tracker else None,
+    }
+
+
+def build_payment_request_rows(payment_requests):
+    names = [pr["name"] for pr in payment_requests]
+    trackers = get_trackers("payment_request", names)
+    paid_from_entries = get_payment_entry_totals("reference_no", names)
+
+    po_names = {
+        pr["reference_name"]
+        for pr in payment_requests
+        if pr.get("reference_doctype") == "Purchase Order" and pr.get("reference_name")
+    }
+    purchase_orders = get_purchase_orders(po_names)
+    po_rollups = get_reference_rollups("Purchase Order", po_names)
+    other_terms = get_reference_payment_terms(
+        (pr.get("reference_doctype"), pr.get("reference_name"))
+        for pr in payment_requests
+        if pr.get("reference_doctype") != "Purchase Order"
+    )
+
+    results = []
+    for pr in payment_requests:
+        tracker = trackers.get(pr["name"])
+        ref_dt = pr.get("reference_doctype")
+        ref_dn = pr.get("reference_name")
+
+        supplier_name = None
+        supplier_id = None
+        if pr.get("party_type") == "Supplier":
+            supplier_id = pr.get("party")
+            supplier_name = pr.get("party_name") or pr.get("party")
+
+        payment_terms_value = None
+        po_grand_total = None
+        po_remaining = None
+        if ref_dt == "Purchase Order":
+            po = purchase_orders.get(ref_dn)
+            if po:
+                payment_terms_value = po.payment_terms
+                po_grand_total = flt(po_rollups[ref_dn].grand_total)
+                po_remaining = flt(po_rollups[ref_dn].outstanding)
+        elif ref_dt and ref_dn:
+            payment_terms_value = other_terms.get((ref_dt, ref_dn))
+
+        # paid comes from submitted Payment Entries, with the tracker as fallback
+        effective_paid = paid_from_entries.get(pr["name"]) or get_tracker_paid(tracker)
+        computed_remaining = max(0.0, flt(pr.get("grand_total")) - effective_paid)
+
+        results.append(
+            {
+                "payment_request": pr["name"],
+                "grand_total": pr["grand_total"],
+                "reference_doctype": ref_dt,
+                "reference_name": ref_dn,
+                "supplier_name": supplier_name,
+                "supplier_id": supplier_id,
+                "payment_terms": payment_terms_value,
+                "transaction_date": pr.get("transaction_date"),
+                "tracker": tracker["name"] if tracker else None,
+                "payment_entry": tracker["payment_entry"] if tracker else None,
+                "total_amount_paid": effective_paid,
+                "total_amount_remaining": computed_remaining,
+                "po_grand_total": po_grand_total,
+                "po_remaining": po_remaining,
+                "budget": tracker["budget"] if tracker else None,
+            }
+        )
+
+    return results
+
+
+def build_payment_requester_rows(payment_requesters):
+    trackers = get_trackers("payment_requester", [prq["name"] for prq in payment_requesters])
+    memo_terms = get_reference_payment_terms(
+        (prq["reference_doctype"], prq.get("reference_name"))
+        for prq in payment_requesters
+        if prq["reference_doctype"] == "Invoice released Memo"
+    )
+
+    results = []
+    for prq in payment_requesters:
+        tracker = trackers.get(prq["name"])
+
+        supplier_name = None
+        supplier_id = None
+        if prq.get("party_type") == "Supplier":
+            supplier_id = prq.get("party")
+            supplier_name = prq.get("party_name") or prq.get("party")
+
+        grand_total = flt(prq.get("grand_total"))
+        total_paid = flt(tracker["total_amount_paid"]) if tracker else 0.0
+        remaining = flt(tracker["total_amount_remaining"]) if tracker else (grand_total - total_paid)
+        remaining = max(0.0, remaining)
+
+        results.append(
+            {
+                "payment_request": prq["name"],
+                "grand_total": grand_total,
+                "reference_doctype": prq["reference_doctype"],
+                "reference_name": prq["reference_name"],
+                "supplier_name": supplier_name,
+                "supplier_id": supplier_id,
+                "payment_terms": memo_terms.get((prq["reference_doctype"], prq.get("reference_name"))),
+                "transaction_date": prq.get("transaction_date"),
+                "tracker": tracker["name"] if tracker else None,
+                "payment_entry": tracker["payment_entry"] if tracker else None,
+                "total_amount_paid": total_paid,
+                "total_amount_remaining": remaining,
+                "po_grand_total": grand_total,
+                "po_remaining": remaining,
+                "budget": tracker["budget"] if tracker else None,
+            }
+        )
+
+    return results
+
+
+def get_tracker_paid(tracker):
+    if tracker and tracker.get("total_amount_paid") is not None:
+        return flt(tracker["total_amount_paid"])
+    return 0.0
+
+
+def get_trackers(link_field, names):
+    """Return Payment Request Trackers keyed by `link_field` (payment_request or payment_requester)."""
+    if not names:
+        return {}
+
+    trackers = frappe.get_all(
+        "Payment Request Tracker",
+        filters={link_field: ["in", list(names)]},
+        fields=[link_field, *TRACKER_FIELDS],
+        order_by="modified desc",
+    )
+
+    # keep the most recently modified tracker, like frappe.db.get_value would
+    result = {}
+    for tracker in trackers:
+        result.setdefault(tracker[link_field], tracker)
+    return result
+
+
+def get_payment_entry_totals(link_field, names):
+    """Sum of submitted Payment Entry paid_amount grouped by `link_field` (reference_no, ...)."""
+    if not names:
+        return {}
+
+    totals = frappe.db.sql(
+        f"""
+        SELECT pe.`{link_field}`, COALESCE(SUM(pe.paid_amount), 0)
+        FROM `tabPayment Entry` pe
+        WHERE pe.docstatus = 1
+        AND pe.`{link_field}` IN %(names)s
+        GROUP BY pe.`{link_field}`
+        """,
+        {"names": tuple(names)},
+    )
+    return {name: flt(total) for name, total in totals}
+
+
+def get_purchase_orders(names):
+    """Purchase Order headers keyed by name, with `payment_terms` from the summary cache."""
+    if not names:
+        return {}
+
+    purchase_orders = frappe.get_all(
+        "Purchase Order",
+        filters={"name": ["in", list(names)]},
+        fields=["name", "modified", "currency", "payment_terms_template"],
+    )
+    payment_terms = get_purchase_order_payment_terms(purchase_orders)
+    for po in purchase_orders:
+        po.payment_terms = payment_terms.get(po.name)
+
+    return {po.name: po for po in purchase_orders}
+
+
+def get_reference_payment_terms(references):
+    """
+    Payment terms of arbitrary referenced documents, keyed by (doctype, name).
+    Uses one query per referenced doctype and tolerates doctypes without the fields.
+    """
+    names_by_doctype = defaultdict(set)
+    for ref_dt, ref_dn in references:
+        if ref_dt and ref_dn:
+            names_by_doctype[ref_dt].add(ref_dn)
+
+    result = {}
+    for ref_dt, ref_names in names_by_doctype.items():
+        try:
+            meta = frappe.get_meta(ref_dt)
+        except frappe.DoesNotExistError:
+            continue
+
+        fields = [f for f in ("payment_terms_template", "payment_terms") if meta.has_field(f)]
+        if not fields:
+            continue
+
+        for doc in frappe.get_all(ref_dt, filters={"name": ["in", list(ref_names)]}, fields=["name", *fields]):
+            result[(ref_dt, doc.name)] = doc.get("payment_terms_template") or doc.get("payment_terms")
+
+    return result
@@ -0,0 +1,193 @@
+"""
+Cached payment-terms summaries for Purchase Orders.
+
+Summaries are stored per Purchase Order together with the `modified` timestamp they were
+built from, in a Redis hash with a bounded in-process LRU in front of it (which also
+serves as the fallback when Redis is unavailable). A cached entry is only used when its
+timestamp matches the Purchase Order being read, so a stale entry can never be served;
+the Purchase Order doc_events below just drop entries that can no longer be used.
+"""
+
+import pickle
+from collections import OrderedDict
+
+import frappe
+from frappe.utils import cstr
+
+CACHE_KEY = "cash_management:po_payment_terms"
+STATS_KEY = "cash_management:po_payment_terms_stats"
+LOCAL_CACHE_SIZE = 2048
+
+_local_cache = OrderedDict()
+_local_stats = {"hits": 0, "misses": 0}
+
+
+def get_purchase_order_payment_terms(purchase_orders):
+    """
+    Return payment terms keyed by Purchase Order name.
+
+    `purchase_orders` are rows with name, modified, currency and payment_terms_template.
+    The template wins when set; otherwise the payment schedule summary is used, built
+    only for Purchase Orders missing from the cache.
+    """
+    result = {}
+    versions = {}
+    for po in purchase_orders:
+        if po.get("payment_terms_template"):
+            result[po.name] = po.payment_terms_template
+        else:
+            versions[po.name] = cstr(po.modified)
+
+    if not versions:
+        return result
+
+    cached = get_cached_summaries(list(versions))
+    misses = []
+    for name, version in versions.items():
+        entry = cached.get(name)
+        if entry and entry[0] == version:
+            result[name] = entry[1]
+        else:
+            misses.append(name)
+
+    record_stats(hits=len(versions) - len(misses), misses=len(misses))
+
+    if misses:
+        currencies = {po.name: po.currency for po in purchase_orders}
+        summaries = build_summaries(misses, currencies)
+        set_cached_summaries({name: (versions[name], summaries.get(name)) for name in misses})
+        result.update(summaries)
+
+    return result
+
+
+def build_summaries(names, currencies):
+    schedule = {}
+    rows = frappe.db.sql(
+        """
+        SELECT parent, payment_term, description, invoice_portion, payment_amount
+        FROM `tabPayment Schedule`
+        WHERE parenttype = 'Purchase Order'
+        AND parent IN %(names)s
+        ORDER BY parent, idx
+        """,
+        {"names": tuple(names)},
+        as_dict=True,
+    )
+    for row in rows:
+        schedule.setdefault(row.parent, []).append(row)
+
+    return {name: build_payment_terms_summary(schedule.get(name), currencies.get(name)) for name in names}
+
+
+def build_payment_terms_summary(schedule, currency=None):
+    """Summarise a payment schedule, e.g. "50% Advance Payment; 50% upon delivery"."""
+    if not schedule:
+        return None
+
+    parts = []
+    for row in schedule:
+        label = row.get("payment_term") or row.get("description") or "Payment"
+        percentage = None
+        # Try percentage first, fallback to amount
+        if row.get("invoice_portion"):
+            percentage = f"{int(row.get('invoice_portion'))}%"
+        amount = None
+        if row.get("payment_amount"):
+            amount = frappe.utils.fmt_money(row.get("payment_amount"), currency=currency)
+        if percentage and label:
+            parts.append(f"{percentage} {label}")
+        elif label and amount:
+            parts.append(f"{label} {amount}")
+        elif label:
+            parts.append(label)
+    return "; ".join(parts)
+
+
+def get_cached_summaries(names):
+    result = {}
+    for name in names:
+        entry = _local_cache.get(local_key(name))
+        if entry:
+            result[name] = entry
+            _local_cache.move_to_end(local_key(name))
+
+    remote = [name for name in names if name not in result]
+    if not remote:
+        return result
+
+    try:
+        values = frappe.cache.hmget(frappe.cache.make_key(CACHE_KEY), remote)
+    except Exception:
+        # Redis unavailable, the local cache is all we have
+        return result
+
+    for name, value in zip(remote, values, strict=True):
+        if value is not None:
+            result[name] = pickle.loads(value)
+            set_local(name, result[name])
+    return result
+
+
+def set_cached_summaries(entries):
+    for name, entry in entries.items():
+        set_local(name, entry)
+
+    try:
+        key = frappe.cache.make_key(CACHE_KEY)
+        pipeline = frappe.cache.pipeline()
+        for name, entry in entries.items():
+            pipeline.hset(key, name, pickle.dumps(entry))
+        pipeline.execute()
+    except Exception:
+        pass
+
+
+def local_key(name):
+    # workers can serve several sites
+    return (frappe.local.site, name)
+
+
+def set_local(name, entry):
+    _local_cache[local_key(name)] = entry
+    _local_cache.move_to_end(local_key(name))
+    while len(_local_cache) > LOCAL_CACHE_SIZE:
+        _local_cache.popitem(last=False)
+
+
+def clear_purchase_order_payment_terms(doc, method=None):
+    """doc_events hook: drop the cached summary of a changed or cancelled Purchase Order."""
+    _local_cache.pop(local_key(doc.name), None)
+    try:
+        frappe.cache.hdel(CACHE_KEY, doc.name)
+    except Exception:
+        pass
+
+
+def record_stats(hits=0, misses=0):
+    _local_stats["hits"] += hits
+    _local_stats["misses"] += misses
+
+    try:
+        key = frappe.cache.make_key(STATS_KEY)
+        if hits:
+            frappe.cache.hincrby(key, "hits", hits)
+        if misses:
+            frappe.cache.hincrby(key, "misses", misses)
+    except Exception:
+        pass
+
+
+@frappe.whitelist()
+def get_payment_terms_cache_stats():
+    """Hit / miss counters of the payment terms cache, site-wide and for this worker."""
+    frappe.only_for("System Manager")
+
+    site = {"hits": 0, "misses": 0}
+    try:
+        values = frappe.cache.hmget(frappe.cache.make_key(STATS_KEY), list(site))
+        site = {counter: int(value or 0) for counter, value in zip(site, values, strict=True)}
+    except Exception:
+        pass
+
+    return {"site": site, "worker": dict(_local_stats), "local_entries": len(_local_cache)}
@@ -0,0 +1,134 @@
+"""
+Query counting and timing for the Payment Management endpoints and the tracker sync jobs.
+
+`log_performance` wraps a function and, for each call, counts the SQL queries it runs,
+their total time and the rows they return, and derives the Python time from the wall
+time. Calls over the thresholds in Cash Management Settings are written to Cash
+Management Perf Log together with their arguments, so expensive filter combinations
+show up in production. The logs go through `deferred_insert`, which keeps the insert
+out of the request and works for read-only GET requests as well.
+
+Queries are counted by shadowing `frappe.db.sql` for the duration of the call; a
+decorated function called from another one is counted as part of the outer call.
+Streamed responses run their queries after the endpoint has returned, so
+`payment_list.stream_entries` measures its chunks itself with `CallMetrics`.
+"""
+
+import functools
+import json
+import time
+from contextlib import contextmanager
+
+import frappe
+from frappe.deferred_insert import deferred_insert
+from frappe.utils import cint
+
+MAX_ARGUMENTS_LENGTH = 2000
+
+
+def log_performance(fn):
+    method = f"{fn.__module__}.{fn.__qualname__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        metrics = CallMetrics()
+        try:
+            with metrics.measure():
+                return fn(*args, **kwargs)
+        finally:
+            metrics.record(method, args, kwargs)
+
+    return wrapper
+
+
+class CallMetrics:
+    """
+    Query count, SQL time, rows read and wall time of the code run under `measure`.
+
+    `measure` can be entered several times for one call, e.g. once per chunk of a
+    streamed response, so time spent outside of it is not counted.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.sql = 0.0
+        self.rows = 0
+        self.duration = 0.0
+        self.measured = False
+
+    @contextmanager
+    def measure(self):
+        if not getattr(frappe.local, "db", None) or getattr(frappe.local, "cash_management_perf", None):
+            # nested in another measured call, which counts these queries
+            yield
+            return
+
+        db = frappe.db
+        sql = db.sql
+
+        def counted_sql(*sql_args, **sql_kwargs):
+            start = time.perf_counter()
+            try:
+                result = sql(*sql_args, **sql_kwargs)
+            finally:
+                self.queries += 1
+                self.sql += time.perf_counter() - start
+            if isinstance(result, list | tuple):
+                self.rows += len(result)
+            return result
+
+        frappe.local.cash_management_perf = self
+        self.measured = True
+        db.sql = counted_sql
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.duration += time.perf_counter() - start
+            # drop the instance attribute so the class method is used again
+            del db.sql
+            frappe.local.cash_management_perf = None
+
+    def record(self, method, args=(), kwargs=None):
+        if not self.measured:
+            return
+        try:
+            record_call(method, args, kwargs or {}, self.duration, self)
+        except Exception:
+            # logging must never break the call it measures
+            pass
+
+
+def record_call(method, args, kwargs, duration, stats):
+    settings = frappe.get_cached_doc("Cash Management Settings")
+    if not cint(settings.enable_perf_log):
+        return
+
+    duration_ms = duration * 1000
+    max_duration = cint(settings.perf_log_min_duration)
+    max_queries = cint(settings.perf_log_max_queries)
+    if not ((max_duration and duration_ms > max_duration) or (max_queries and stats.queries > max_queries)):
+        return
+
+    sql_ms = stats.sql * 1000
+    deferred_insert(
+        "Cash Management Perf Log",
+        [
+            {
+                "method": method,
+                "user": frappe.session.user,
+                "arguments": get_arguments(args, kwargs),
+                "duration_ms": round(duration_ms, 3),
+                "sql_ms": round(sql_ms, 3),
+                "python_ms": round(duration_ms - sql_ms, 3),
+                "query_count": stats.queries,
+                "row_count": stats.rows,
+            }
+        ],
+    )
+
+
+def get_arguments(args, kwargs):
+    kwargs = {key: value for key, value in kwargs.items() if key != "cmd"}
+    arguments = json.dumps({"args": args, **kwargs} if args else kwargs, default=str)
+    return arguments[:MAX_ARGUMENTS_LENGTH]
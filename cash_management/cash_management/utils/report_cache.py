@@ -0,0 +1,60 @@
+"""
+Result cache of the Payment Requester Report with Request Tracker.
+
+The report is a prepared report, so it runs on a background worker and Frappe keeps the
+last result per filter set as a Prepared Report. On top of that the rows are cached in
+Redis per filter set, so regenerating a month-end view nobody has touched since is a
+single lookup. Creating, changing, submitting, cancelling or deleting a Payment Entry of
+a Payment Requester (drafts included, the report lists them too), or changing one of its
+trackers, drops the cached rows and the stored Prepared Reports of the report.
+"""
+
+import hashlib
+import json
+
+import frappe
+
+REPORT_NAME = "Payment Requester Report with Request Tracker"
+CACHE_KEY = "cash_management:requester_report:{0}"
+CACHE_TTL = 24 * 60 * 60
+
+
+def get_cached_report_data(filters, get_data):
+    """Rows of the report for `filters`, computed with `get_data(filters)` on a miss."""
+    key = CACHE_KEY.format(get_filters_hash(filters))
+    data = frappe.cache.get_value(key)
+    if data is None:
+        data = get_data(filters)
+        frappe.cache.set_value(key, data, expires_in_sec=CACHE_TTL)
+    return data
+
+
+def get_filters_hash(filters):
+    filters = {key: value for key, value in (filters or {}).items() if value not in (None, "")}
+    return hashlib.sha1(json.dumps(filters, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def clear_requester_report_cache():
+    frappe.cache.delete_keys(CACHE_KEY.format(""))
+    frappe.enqueue(
+        delete_prepared_reports,
+        queue="short",
+        job_id="cash_management::delete_requester_prepared_reports",
+        deduplicate=True,
+        enqueue_after_commit=True,
+    )
+
+
+def delete_prepared_reports():
+    for name in frappe.get_all("Prepared Report", filters={"report_name": REPORT_NAME}, pluck="name"):
+        frappe.delete_doc("Prepared Report", name, ignore_permissions=True, delete_permanently=True)
+
+
+def on_payment_entry_change(doc, method=None):
+    if doc.get("custom_payment_reference_name"):
+        clear_requester_report_cache()
+
+
+def on_tracker_change(doc, method=None):
+    if doc.payment_requester:
+        clear_requester_report_cache()
@@ -0,0 +1,71 @@
+"""
+Bulk budget allocation for the Payment Management Budget page.
+
+Budgets are written with one `UPDATE ... CASE` per chunk instead of loading and saving
+every Payment Request Tracker: the budget does not take part in the tracker's
+`before_save` calculations, so there is nothing to run per document. The same values
+are written to the Cash Management read model, which would otherwise be refreshed by
+the tracker's doc_events.
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import flt, now
+
+CHUNK_SIZE = 500
+
+
+def update_tracker_budgets(budgets):
+    """
+    Set the budget of many trackers in one transaction.
+
+    `budgets` is a list of (tracker, budget) pairs or {"tracker", "budget"} dicts; the last
+    value wins for a repeated tracker. Returns the updated trackers with their budget.
+    """
+    values = {}
+    for entry in budgets or []:
+        tracker, budget = (entry.get("tracker"), entry.get("budget")) if isinstance(entry, dict) else entry
+        if tracker:
+            values[tracker] = flt(budget)
+
+    if not values:
+        return []
+
+    existing = set(frappe.get_all("Payment Request Tracker", filters={"name": ["in", list(values)]}, pluck="name"))
+    missing = [tracker for tracker in values if tracker not in existing]
+    if missing:
+        frappe.throw(
+            _("Payment Request Tracker not found: {0}").format(", ".join(missing)), frappe.DoesNotExistError
+        )
+
+    names = list(values)
+    for start in range(0, len(names), CHUNK_SIZE):
+        chunk = {name: values[name] for name in names[start : start + CHUNK_SIZE]}
+        set_budgets("Payment Request Tracker", "name", chunk)
+        set_budgets("Cash Management", "tracker", chunk)
+
+    return frappe.get_all(
+        "Payment Request Tracker",
+        filters={"name": ["in", names]},
+        fields=["name as tracker", "budget", "payment_request", "payment_requester"],
+    )
+
+
+def set_budgets(doctype, key_field, budgets):
+    params = {"names": tuple(budgets), "modified": now(), "user": frappe.session.user}
+    cases = []
+    for i, (name, budget) in enumerate(budgets.items()):
+        cases.append(f"WHEN %(name_{i})s THEN %(budget_{i})s")
+        params[f"name_{i}"] = name
+        params[f"budget_{i}"] = budget
+
+    frappe.db.sql(
+        f"""
+        UPDATE `tab{doctype}`
+        SET budget = CASE `{key_field}` {" ".join(cases)} ELSE budget END,
+            modified = %(modified)s,
+            modified_by = %(user)s
+        WHERE `{key_field}` IN %(names)s
+        """,
+        params,
+    )
@@ -0,0 +1,115 @@
+"""
+Child rows, totals and Payment Entries of Payment Request Trackers, as shown in the
+tracker dialog of the Payment Management pages.
+
+Payment Entries of a Payment Request are found either through a Payment Entry Reference
+row or through Payment Entry.reference_no. The two are looked up as separate indexed
+queries combined with UNION (which also removes duplicates) rather than one LEFT JOIN
+with an OR, which MariaDB can only answer by scanning Payment Entry.
+"""
+
+import frappe
+from frappe import _
+
+PAYMENT_ENTRY_FIELDS = ["name", "posting_date", "paid_amount", "party", "mode_of_payment", "status"]
+
+
+def get_tracker_details(tracker_name):
+    details = get_trackers_details([tracker_name])
+    if tracker_name not in details:
+        frappe.throw(
+            _("{0} {1} not found").format(_("Payment Request Tracker"), tracker_name), frappe.DoesNotExistError
+        )
+    return details[tracker_name]
+
+
+def get_trackers_details(tracker_names):
+    """Return {tracker: {child_rows, totals, payment_entries}} for all trackers in a few queries."""
+    tracker_names = list({name for name in tracker_names if name})
+    if not tracker_names:
+        return {}
+
+    trackers = frappe.get_all(
+        "Payment Request Tracker",
+        filters={"name": ["in", tracker_names]},
+        fields=["name", "payment_request", "payment_entry", "total_amount_paid", "total_amount_remaining"],
+    )
+
+    child_rows = {}
+    for row in frappe.get_all(
+        "Payment Request Details",
+        filters={"parenttype": "Payment Request Tracker", "parent": ["in", tracker_names]},
+        fields=["*"],
+        order_by="parent, idx",
+    ):
+        child_rows.setdefault(row.parent, []).append(row)
+
+    entries_by_request = get_payment_entries_by_request([t.payment_request for t in trackers])
+
+    # fallback: the single payment_entry stored on a tracker with nothing found above
+    fallback_names = [
+        t.payment_entry for t in trackers if t.payment_entry and not entries_by_request.get(t.payment_request)
+    ]
+    fallback_entries = {}
+    if fallback_names:
+        fallback_entries = {
+            pe.name: pe
+            for pe in frappe.get_all(
+                "Payment Entry", filters={"name": ["in", fallback_names]}, fields=PAYMENT_ENTRY_FIELDS
+            )
+        }
+
+    result = {}
+    for tracker in trackers:
+        payment_entries = entries_by_request.get(tracker.payment_request) or []
+        if not payment_entries and tracker.payment_entry in fallback_entries:
+            payment_entries = [fallback_entries[tracker.payment_entry]]
+
+        result[tracker.name] = {
+            "child_rows": child_rows.get(tracker.name, []),
+            "totals": {
+                "total_amount_paid": tracker.total_amount_paid,
+                "total_amount_remaining": tracker.total_amount_remaining,
+            },
+            "payment_entries": payment_entries,
+        }
+
+    return result
+
+
+def get_payment_entries_by_request(payment_requests):
+    """Submitted Payment Entries per Payment Request, newest first."""
+    payment_requests = {name for name in payment_requests if name}
+    if not payment_requests:
+        return {}
+
+    fields = ", ".join(f"pe.{field}" for field in PAYMENT_ENTRY_FIELDS)
+    rows = frappe.db.sql(
+        f"""
+        SELECT per.reference_name AS payment_request, {fields}, pe.creation
+        FROM `tabPayment Entry Reference` per
+        INNER JOIN `tabPayment Entry` pe
+        ON pe.name = per.parent
+        WHERE per.reference_doctype = 'Payment Request'
+        AND per.reference_name IN %(payment_requests)s
+        AND pe.docstatus = 1
+
+        UNION
+
+        SELECT pe.reference_no AS payment_request, {fields}, pe.creation
+        FROM `tabPayment Entry` pe
+        WHERE pe.docstatus = 1
+        AND pe.reference_no IN %(payment_requests)s
+
+        ORDER BY posting_date DESC, creation DESC
+        """,
+        {"payment_requests": tuple(payment_requests)},
+        as_dict=True,
+    )
+
+    result = {}
+    for row in rows:
+        payment_request = row.pop("payment_request")
+        row.pop("creation")
+        result.setdefault(payment_request, []).append(row)
+    return result
@@ -0,0 +1,199 @@
+"""
+Saving the child table of a Payment Request Tracker from the tracker dialog.
+
+Every child row carries a stable `row_key` and a link to the Payment Entry it produced.
+On save only rows that are new or whose date / paid amount changed touch their Payment
+Entry: a new row creates one, a changed row updates its draft Payment Entry in place and
+a removed row deletes its draft. Unchanged rows are left alone, so saving again never
+posts twice. Submitted Payment Entries are never modified; the row has to be cleared by
+cancelling the Payment Entry first. All of it runs in one transaction.
+
+Posting through ERPNext is slow, so the dialog runs it on the long queue
+(`enqueue_update_tracker_child_table`) and follows PROGRESS_EVENT realtime messages.
+"""
+
+import frappe
+from erpnext.accounts.doctype.payment_request.payment_request import make_payment_entry
+from frappe import _
+from frappe.utils import flt, getdate
+
+PROGRESS_EVENT = "cash_management_tracker_update"
+
+
+def update_tracker_child_table(tracker_name, rows, totals=None, progress=None):
+    """
+    Save the dialog rows of a tracker, posting only new or changed rows.
+
+    `progress`, when given, is called after every new, changed or removed row with
+    (done, total, posted, result): `posted` counts the rows that actually inserted, updated
+    or deleted a Payment Entry so far, result holds the row_key and Payment Entry of the row.
+    """
+    totals = totals or {}
+    total_paid = flt(totals.get("total_amount_paid"))
+    total_remaining = flt(totals.get("total_amount_remaining"))
+    grand_total = total_paid + total_remaining
+
+    tracker_doc = frappe.get_doc("Payment Request Tracker", tracker_name)
+    existing = {row.row_key: row for row in tracker_doc.payment_request_details if row.row_key}
+
+    if totals:
+        tracker_doc.total_amount_paid = totals.get("total_amount_paid")
+        tracker_doc.total_amount_remaining = totals.get("total_amount_remaining")
+
+    details = []
+    changed = []
+    for r in rows:
+        before = existing.pop(r.get("row_key"), None) if r.get("row_key") else None
+        paid_amount = flt(r.get("paid_amount"))
+        row = frappe._dict(
+            row_key=before.row_key if before else frappe.generate_hash(length=12),
+            transaction_date=r.get("transaction_date"),
+            paid=flt(r.get("paid")),
+            paid_amount=paid_amount,
+            unpaid_amount=max(0.0, grand_total - paid_amount),
+            payment_entry=before.payment_entry if before else None,
+        )
+        details.append(row)
+        if is_changed(before, row):
+            changed.append(row)
+
+    # rows removed in the dialog drop their Payment Entry
+    removed = [frappe._dict(payment_entry=row.payment_entry, paid_amount=0) for row in existing.values()]
+    docstatus = get_payment_entry_docstatus(row.payment_entry for row in changed + removed)
+
+    for row in changed + removed:
+        if docstatus.get(row.payment_entry) == 1:
+            frappe.throw(
+                _("Payment Entry {0} is already submitted. Cancel it before changing or removing its row.").format(
+                    row.payment_entry
+                )
+            )
+
+    try:
+        postings = changed + removed
+        posted = 0
+        for done, row in enumerate(postings, 1):
+            entry_docstatus = docstatus.get(row.payment_entry)
+            row.payment_entry = post_payment_entry(tracker_doc, row.payment_entry, entry_docstatus, row.paid_amount)
+            # a draft is always updated or deleted, otherwise only a newly inserted entry counts
+            if entry_docstatus == 0 or row.payment_entry:
+                posted += 1
+            if progress:
+                progress(done, len(postings), posted, {"row_key": row.row_key, "payment_entry": row.payment_entry})
+
+        tracker_doc.set("payment_request_details", details)
+        tracker_doc.save(ignore_permissions=True)
+        frappe.db.commit()
+
+    except Exception:
+        frappe.db.rollback()
+        frappe.log_error(
+            frappe.get_traceback(), f"Payment Entry creation failed for {tracker_doc.payment_request}"
+        )
+        frappe.throw(
+            _("Payment Entry creation failed for {0}. Please check Error Log for details.").format(
+                tracker_doc.payment_request
+            )
+        )
+
+    return {"status": "success", "posted": posted}
+
+
+def enqueue_update_tracker_child_table(tracker_name, rows, totals=None):
+    """Run `update_tracker_child_table` on the long queue and return the job id right away."""
+    job_id = f"cash_management::tracker_update::{tracker_name}::{frappe.generate_hash(length=8)}"
+    frappe.enqueue(
+        run_tracker_update,
+        queue="long",
+        timeout=3600,
+        job_id=job_id,
+        tracker_name=tracker_name,
+        rows=rows,
+        totals=totals,
+        progress_id=job_id,
+    )
+    return {"status": "queued", "job_id": job_id}
+
+
+def run_tracker_update(tracker_name, rows, totals, progress_id):
+    """Background job: post the rows and report progress to the user over realtime."""
+
+    def publish(status, **message):
+        frappe.publish_realtime(
+            PROGRESS_EVENT,
+            {"job_id": progress_id, "tracker": tracker_name, "status": status, **message},
+            user=frappe.session.user,
+        )
+
+    def progress(done, total, posted, result):
+        publish("progress", done=done, total=total, posted=posted, result=result)
+
+    publish("started")
+    try:
+        result = update_tracker_child_table(tracker_name, rows, totals, progress=progress)
+    except frappe.ValidationError as e:
+        publish("failed", message=str(e))
+        return
+
+    publish("completed", posted=result["posted"])
+
+
+def get_payment_entry_docstatus(names):
+    names = [name for name in names if name]
+    if not names:
+        return {}
+    return dict(
+        frappe.get_all("Payment Entry", filters={"name": ["in", names]}, fields=["name", "docstatus"], as_list=True)
+    )
+
+
+def is_changed(before, row):
+    if not before:
+        return True
+    if flt(before.paid_amount) != row.paid_amount:
+        return True
+    return (getdate(before.transaction_date) if before.transaction_date else None) != (
+        getdate(row.transaction_date) if row.transaction_date else None
+    )
+
+
+def post_payment_entry(tracker_doc, payment_entry, docstatus, paid_amount):
+    """
+    Bring the row's Payment Entry in line with `paid_amount` and return its name.
+
+    A draft Payment Entry is updated in place (or deleted when the amount drops to zero);
+    a cancelled or missing one is replaced with a new draft when there is an amount.
+    """
+    if docstatus == 0:
+        if paid_amount <= 0:
+            frappe.delete_doc("Payment Entry", payment_entry, ignore_permissions=True)
+            return None
+
+        pe_doc = frappe.get_doc("Payment Entry", payment_entry)
+        set_paid_amount(pe_doc, paid_amount)
+        pe_doc.save(ignore_permissions=True)
+        return pe_doc.name
+
+    if paid_amount <= 0 or not tracker_doc.payment_request:
+        return None
+
+    pe_doc = make_payment_entry(tracker_doc.payment_request)
+    if isinstance(pe_doc, dict):
+        pe_doc = frappe.get_doc(pe_doc)
+
+    set_paid_amount(pe_doc, paid_amount)
+    pe_doc.reference_no = tracker_doc.payment_request
+    pe_doc.name = None
+    pe_doc.insert(ignore_permissions=True)
+    return pe_doc.name
+
+
+def set_paid_amount(pe_doc, paid_amount):
+    pe_doc.paid_amount = paid_amount
+    pe_doc.received_amount = paid_amount
+    pe_doc.base_received_amount = paid_amount
+    pe_doc.total_allocated_amount = paid_amount
+    pe_doc.base_total_allocated_amount = paid_amount
+
+    if pe_doc.references and len(pe_doc.references) > 0:
+        pe_doc.references[0].allocated_amount = paid_amount
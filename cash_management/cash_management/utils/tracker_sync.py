@@ -0,0 +1,184 @@
+"""
+Sharded execution of the daily tracker sync across RQ workers.
+
+The coordinator splits the Payment Request / Payment Requester names due for sync into
+chunks of the configured batch size and enqueues one long-queue job per chunk, so the
+sync spreads over all available workers. Run state (chunk names, per-chunk status,
+attempts and timings) lives in a Redis hash per run for a few days. A failed chunk is
+retried on its own, up to MAX_ATTEMPTS times, and can be retried by hand afterwards;
+the sync watermark only advances once every chunk of the run has completed.
+"""
+
+import time
+
+import frappe
+from frappe import _
+from frappe.utils import cint, now_datetime, scrub
+
+from cash_management.cash_management.doctype.payment_request_tracker.payment_request_tracker import (
+    SYNC_SOURCES,
+    advance_sync_watermark,
+    get_sync_batch_size,
+    get_sync_names,
+    sync_tracker_chunk,
+)
+from cash_management.cash_management.utils.perf_log import log_performance
+
+RUN_KEY = "cash_management:tracker_sync_run:{0}"
+LAST_RUN_KEY = "cash_management:tracker_sync_last_run:{0}"
+RUN_TTL = 3 * 24 * 60 * 60
+MAX_ATTEMPTS = 3
+
+
+@log_performance
+def run_sharded_tracker_sync(full=False):
+    """Scheduler entry point: one sharded run per source doctype."""
+    for source_doctype in SYNC_SOURCES:
+        start_sync_run(source_doctype, full=full)
+
+
+def start_sync_run(source_doctype, full=False, batch_size=None):
+    """Split the names due for sync into chunks, enqueue one job per chunk and return the run id."""
+    started, names = get_sync_names(source_doctype, full=full)
+    batch_size = get_sync_batch_size(batch_size)
+
+    chunks = [names[start : start + batch_size] for start in range(0, len(names), batch_size)]
+    if not chunks:
+        advance_sync_watermark(source_doctype, started)
+        return None
+
+    run_id = f"{scrub(source_doctype)}-{frappe.generate_hash(length=8)}"
+    key = RUN_KEY.format(run_id)
+    frappe.cache.hset(
+        key,
+        "meta",
+        {
+            "source_doctype": source_doctype,
+            "started": started,
+            "full": full,
+            "chunks": len(chunks),
+            "rows": len(names),
+        },
+    )
+    for chunk_no, chunk in enumerate(chunks):
+        frappe.cache.hset(key, f"names:{chunk_no}", chunk)
+    frappe.cache.hincrby(frappe.cache.make_key(key), "pending", len(chunks))
+    frappe.cache.expire(frappe.cache.make_key(key), RUN_TTL)
+    frappe.cache.set_value(LAST_RUN_KEY.format(source_doctype), run_id, expires_in_sec=RUN_TTL)
+
+    for chunk_no in range(len(chunks)):
+        enqueue_chunk(run_id, chunk_no)
+
+    return run_id
+
+
+def enqueue_chunk(run_id, chunk_no, attempt=1):
+    frappe.enqueue(
+        run_sync_chunk,
+        queue="long",
+        timeout=3600,
+        job_id=f"cash_management::tracker_sync::{run_id}::{chunk_no}::{attempt}",
+        run_id=run_id,
+        chunk_no=chunk_no,
+        attempt=attempt,
+    )
+
+
+@log_performance
+def run_sync_chunk(run_id, chunk_no, attempt=1):
+    """Background job: sync one chunk of a run and record its result."""
+    key = RUN_KEY.format(run_id)
+    meta = frappe.cache.hget(key, "meta")
+    names = frappe.cache.hget(key, f"names:{chunk_no}")
+    if not meta or names is None:
+        # run state expired
+        return
+
+    start = time.monotonic()
+    try:
+        sync_tracker_chunk(meta["source_doctype"], names)
+        frappe.db.commit()
+    except Exception as e:
+        frappe.db.rollback()
+        frappe.log_error(title=f"Tracker sync chunk {chunk_no} of {run_id} failed")
+        record_result(key, chunk_no, "Failed", attempt, len(names), start, error=str(e))
+        if attempt < MAX_ATTEMPTS:
+            enqueue_chunk(run_id, chunk_no, attempt + 1)
+            return
+    else:
+        record_result(key, chunk_no, "Completed", attempt, len(names), start)
+
+    finish_chunk(key, meta)
+
+
+def record_result(key, chunk_no, status, attempt, rows, start, error=None):
+    frappe.cache.hset(
+        key,
+        f"result:{chunk_no}",
+        {
+            "chunk": chunk_no,
+            "status": status,
+            "attempt": attempt,
+            "rows": rows,
+            "seconds": round(time.monotonic() - start, 3),
+            "finished": now_datetime(),
+            "error": error,
+        },
+    )
+
+
+def finish_chunk(key, meta):
+    """Count the chunk as done; the last one advances the watermark if all succeeded."""
+    if frappe.cache.hincrby(frappe.cache.make_key(key), "pending", -1) > 0:
+        return
+
+    results = get_results(key, meta)
+    if all(result and result["status"] == "Completed" for result in results):
+        advance_sync_watermark(meta["source_doctype"], meta["started"])
+
+
+def get_results(key, meta):
+    return [frappe.cache.hget(key, f"result:{chunk_no}") for chunk_no in range(meta["chunks"])]
+
+
+@frappe.whitelist()
+def get_tracker_sync_run(run_id=None, source_doctype=None):
+    """Per-chunk results and timings of a run (by default the last run of `source_doctype`)."""
+    frappe.only_for("System Manager")
+
+    if not run_id:
+        run_id = frappe.cache.get_value(LAST_RUN_KEY.format(source_doctype or "Payment Request"))
+    meta = frappe.cache.hget(RUN_KEY.format(run_id), "meta") if run_id else None
+    if not meta:
+        frappe.throw(_("Tracker sync run {0} not found").format(run_id or ""), frappe.DoesNotExistError)
+
+    results = get_results(RUN_KEY.format(run_id), meta)
+    finished = [result for result in results if result]
+    return {
+        "run_id": run_id,
+        **meta,
+        "completed": sum(1 for result in finished if result["status"] == "Completed"),
+        "failed": [result["chunk"] for result in finished if result["status"] == "Failed"],
+        "worker_seconds": round(sum(result["seconds"] for result in finished), 3),
+        "wall_seconds": (
+            round((max(result["finished"] for result in finished) - meta["started"]).total_seconds(), 3)
+            if finished
+            else None
+        ),
+        "results": results,
+    }
+
+
+@frappe.whitelist()
+def retry_tracker_sync_chunk(run_id, chunk_no):
+    """Run a failed chunk of a run again."""
+    frappe.only_for("System Manager")
+
+    key = RUN_KEY.format(run_id)
+    chunk_no = cint(chunk_no)
+    result = frappe.cache.hget(key, f"result:{chunk_no}")
+    if not result or result["status"] != "Failed":
+        frappe.throw(_("Chunk {0} of {1} has not failed").format(chunk_no, run_id))
+
+    frappe.cache.hincrby(frappe.cache.make_key(key), "pending", 1)
+    enqueue_chunk(run_id, chunk_no, result["attempt"] + 1)
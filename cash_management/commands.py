@@ -0,0 +1,93 @@
+import json
+
+import click
+import frappe
+from frappe.commands import get_site, pass_context
+
+
+@click.command("rebuild-cash-management")
+@click.option("--chunk-size", default=1000, help="Source documents processed per commit")
+@pass_context
+def rebuild_cash_management(context, chunk_size=1000):
+    "Rebuild the Cash Management read model behind the Payment Management pages"
+    from cash_management.cash_management.doctype.cash_management.cash_management import (
+        rebuild_cash_management,
+    )
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        rebuild_cash_management(chunk_size=chunk_size)
+        frappe.db.commit()
+    finally:
+        frappe.destroy()
+
+
+@click.command("benchmark-payment-indexes")
+@click.option("--rows", default=100000, help="Generated rows per scratch table")
+@click.option("--repeat", default=50, help="Executions timed per query")
+@pass_context
+def benchmark_payment_indexes(context, rows=100000, repeat=50):
+    "Time the Payment Entry / Payment Request / tracker lookups with and without their indexes"
+    from cash_management.cash_management.utils.index_benchmark import run_index_benchmark
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        click.echo(json.dumps(run_index_benchmark(rows=rows, repeat=repeat), indent=2))
+    finally:
+        frappe.destroy()
+
+
+@click.command("reconcile-payment-trackers")
+@pass_context
+def reconcile_payment_trackers(context):
+    "Recompute every Payment Request Tracker, ignoring the incremental sync watermarks"
+    from cash_management.cash_management.doctype.payment_request_tracker.payment_request_tracker import (
+        reconcile_payment_trackers,
+    )
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        reconcile_payment_trackers()
+        frappe.db.commit()
+    finally:
+        frappe.destroy()
+
+
+@click.command("benchmark-cash-management")
+@click.option("--scale", default="10k", help="Payment Requests / Requesters to generate: 10k, 100k, 1m or a number")
+@click.option("--repeat", default=5, help="Executions timed per endpoint")
+@click.option("--output", help="Write the JSON results to this file instead of stdout")
+@click.option("--keep-data", is_flag=True, default=False, help="Keep the generated documents afterwards")
+@pass_context
+def benchmark_cash_management(context, scale="10k", repeat=5, output=None, keep_data=False):
+    "Generate synthetic payment data and time the Payment Management endpoints, reports and sync jobs"
+    from cash_management.cash_management.utils.endpoint_benchmark import run_endpoint_benchmark
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        result = json.dumps(
+            run_endpoint_benchmark(scale=scale, repeat=repeat, keep_data=keep_data), indent=2, default=str
+        )
+        if output:
+            with open(output, "w") as f:
+                f.write(result)
+        else:
+            click.echo(result)
+    finally:
+        frappe.destroy()
+
+
+commands = [
+    rebuild_cash_management,
+    benchmark_payment_indexes,
+    reconcile_payment_trackers,
+    benchmark_cash_management,
+]
@@ -145,13 +145,128 @@ app_license = "mit"
 # 		"on_trash": "method"
 # 	}
 # }
+doc_events = {
+    "Purchase Order": {
+        # also runs on submit, so submitted Purchase Orders refresh the read model as well
+        "on_update": [
+            "cash_management.cash_management.utils.payment_terms.clear_purchase_order_payment_terms",
+            "cash_management.cash_management.doctype.payment_reference_rollup.payment_reference_rollup.on_reference_update",
+            "cash_management.cash_management.doctype.cash_management.cash_management.on_purchase_order_update",
+        ],
+        "on_update_after_submit": [
+            "cash_management.cash_management.utils.payment_terms.clear_purchase_order_payment_terms",
+            "cash_management.cash_management.doctype.payment_reference_rollup.payment_reference_rollup.on_reference_update",
+            "cash_management.cash_management.doctype.cash_management.cash_management.on_purchase_order_update",
+        ],
+        "on_cancel": [
+            "cash_management.cash_management.utils.payment_terms.clear_purchase_order_payment_terms",
+            "cash_management.cash_management.doctype.payment_reference_rollup.payment_reference_rollup.on_reference_update",
+            "cash_management.cash_management.doctype.cash_management.cash_management.on_purchase_order_update",
+        ],
+        "on_trash": [
+            "cash_management.cash_management.utils.payment_terms.clear_purchase_order_payment_terms",
+            "cash_management.cash_management.doctype.payment_reference_rollup.payment_reference_rollup.on_reference_trash",
+        ],
+    },
+    "Payment Request": {
+        "on_update": [
+            "cash_management.cash_management.doctype.payment_search_trigram.payment_search_trigram.on_source_update",
+            "cash_management.cash_management.doctype.cash_management.cash_management.on_source_update",
+            "cash_management.cash_management.doctype.payment_request_tracker.payment_request_tracker.on_source_change",
+        ],
+        "on_cancel": [
+            "cash_management.cash_management.doctype.cash_management.cash_management.on_source_update",
+            "cash_management.cash_management.doctype.payment_request_tracker.payment_request_tracker.on_source_change",
+        ],
+        "on_update_after_submit": [
+            "cash_management.cash_management.doctype.cash_management.cash_management.on_source_update",
+            "cash_management.cash_management.doctype.payment_request_tracker.payment_request_tracker.on_source_change",
+        ],
+        "after_rename": "cash_management.cash_management.doctype.payment_search_trigram.payment_search_trigram.on_source_rename",
+        "on_trash": [
+            "cash_management.cash_management.doctype.payment_search_trigram.payment_search_trigram.on_source_trash",
+            "cash_management.cash_management.doctype.cash_management.cash_management.on_source_trash",
+        ],
+    },
+    "Payment Requester": {
+        "on_update": [
+            "cash_management.cash_management.doctype.payment_search_trigram.payment_search_trigram.on_source_update",
+            "cash_management.cash_management.doctype.cash_management.cash_management.on_source_update",
+            "cash_management.cash_management.doctype.payment_request_tracker.payment_request_tracker.on_source_change",
+        ],
+        "on_cancel": [
+            "cash_management.cash_management.doctype.cash_management.cash_management.on_source_update",
+            "cash_management.cash_management.doctype.payment_request_tracker.payment_request_tracker.on_source_change",
+        ],
+        "on_update_after_submit": [
+            "cash_management.cash_management.doctype.cash_management.cash_management.on_source_update",
+            "cash_management.cash_management.doctype.payment_request_tracker.payment_request_tracker.on_source_change",
+        ],
+        "after_rename": "cash_management.cash_management.doctype.payment_search_trigram.payment_search_trigram.on_source_rename",
+        "on_trash": [
+            "cash_management.cash_management.doctype.payment_search_trigram.payment_search_trigram.on_source_trash",
+            "cash_management.cash_management.doctype.cash_management.cash_management.on_source_trash",
+        ],
+    },
+    "Payment Entry": {
+        "on_submit": [
+            "cash_management.cash_management.doctype.payment_reference_rollup.payment_reference_rollup.on_payment_entry_update",
+            "cash_management.cash_management.doctype.cash_management.cash_management.on_payment_entry_update",
+            "cash_management.cash_management.doctype.payment_request_tracker.payment_request_tracker.on_payment_entry_change",
+            "cash_management.cash_management.utils.report_cache.on_payment_entry_change",
+        ],
+        "on_cancel": [
+            "cash_management.cash_management.doctype.payment_reference_rollup.payment_reference_rollup.on_payment_entry_update",
+            "cash_management.cash_management.doctype.cash_management.cash_management.on_payment_entry_update",
+            "cash_management.cash_management.doctype.payment_request_tracker.payment_request_tracker.on_payment_entry_change",
+            "cash_management.cash_management.utils.report_cache.on_payment_entry_change",
+        ],
+        "on_update_after_submit": [
+            "cash_management.cash_management.doctype.cash_management.cash_management.on_payment_entry_update",
+            "cash_management.cash_management.doctype.payment_request_tracker.payment_request_tracker.on_payment_entry_change",
+            "cash_management.cash_management.utils.report_cache.on_payment_entry_change",
+        ],
+        "after_insert": "cash_management.cash_management.utils.report_cache.on_payment_entry_change",
+        "on_update": "cash_management.cash_management.utils.report_cache.on_payment_entry_change",
+        "on_trash": "cash_management.cash_management.utils.report_cache.on_payment_entry_change",
+    },
+    "Supplier": {
+        "after_insert": "cash_management.cash_management.utils.party_search.clear_party_name_map",
+        "on_update": "cash_management.cash_management.utils.party_search.clear_party_name_map",
+        "after_rename": "cash_management.cash_management.utils.party_search.clear_party_name_map",
+        "on_trash": "cash_management.cash_management.utils.party_search.clear_party_name_map",
+    },
+    "Customer": {
+        "after_insert": "cash_management.cash_management.utils.party_search.clear_party_name_map",
+        "on_update": "cash_management.cash_management.utils.party_search.clear_party_name_map",
+        "after_rename": "cash_management.cash_management.utils.party_search.clear_party_name_map",
+        "on_trash": "cash_management.cash_management.utils.party_search.clear_party_name_map",
+    },
+    "Payment Request Tracker": {
+        "on_update": [
+            "cash_management.cash_management.doctype.cash_management.cash_management.on_tracker_update",
+            "cash_management.cash_management.utils.report_cache.on_tracker_change",
+        ],
+        "after_delete": [
+            "cash_management.cash_management.doctype.cash_management.cash_management.on_tracker_update",
+            "cash_management.cash_management.utils.report_cache.on_tracker_change",
+        ],
+    },
+    "Cash Management Budget": {
+        "on_update": "cash_management.cash_management.utils.budget_notification.clear_budget_recipients",
+    },
+    # Has Role rows are saved through their User, so User on_update also covers role changes
+    "User": {
+        "on_update": "cash_management.cash_management.utils.budget_notification.clear_budget_recipients",
+        "after_delete": "cash_management.cash_management.utils.budget_notification.clear_budget_recipients",
+    },
+}
 
 # Scheduled Tasks
 # ---------------
 scheduler_events = {
     "daily": [
-        "cash_management.cash_management.doctype.payment_request_tracker.payment_request_tracker.sync_payment_request_trackers",
-        "cash_management.cash_management.doctype.payment_request_tracker.payment_request_tracker.sync_payment_requester_trackers",
+        "cash_management.cash_management.utils.tracker_sync.run_sharded_tracker_sync",
     ]
 }
 # scheduler_events = {
@@ -248,3 +363,7 @@ scheduler_events = {
 # 	"Logging DocType Name": 30  # days to retain logs
 # }
 
+default_log_clearing_doctypes = {
+    "Cash Management Perf Log": 30,
+}
+
@@ -0,0 +1,19 @@
+import frappe
+
+# (doctype, columns) of the lookups behind the Payment Management pages, the read model
+# refresh and the tracker sync jobs. Payment Request Tracker.payment_request and
+# payment_requester are indexed through `search_index` in its JSON.
+INDEXES = [
+    ("Payment Entry", ["reference_no"]),
+    ("Payment Entry", ["custom_payment_reference_name"]),
+    ("Payment Entry", ["docstatus", "reference_no"]),
+    ("Payment Request", ["reference_doctype", "reference_name", "transaction_date"]),
+    ("Payment Requester", ["reference_doctype", "reference_name", "transaction_date"]),
+]
+
+
+def execute():
+    for doctype, columns in INDEXES:
+        # custom_payment_reference_name is a Custom Field and may not exist on every site
+        if all(frappe.db.has_column(doctype, column) for column in columns):
+            frappe.db.add_index(doctype, columns)
@@ -0,0 +1,8 @@
+from cash_management.cash_management.doctype.payment_reference_rollup.payment_reference_rollup import (
+    rebuild_reference_rollups,
+)
+
+
+def execute():
+    # Purchase Order paid totals are read from the rollup instead of joining Payment Entries
+    rebuild_reference_rollups("Purchase Order")
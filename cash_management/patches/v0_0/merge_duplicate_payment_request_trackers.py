@@ -0,0 +1,60 @@
+import frappe
+
+from cash_management.cash_management.doctype.payment_request_tracker.payment_request_tracker import (
+    SYNC_SOURCES,
+    on_doctype_update,
+)
+
+
+def execute():
+    for source in SYNC_SOURCES.values():
+        merge_duplicate_trackers(source["tracker_field"])
+
+    # unique indexes, so concurrent syncs cannot insert duplicates again
+    on_doctype_update()
+
+
+def merge_duplicate_trackers(tracker_field):
+    """Keep the oldest tracker of every source and move the rows of the others onto it."""
+    frappe.db.sql(
+        f"""
+        UPDATE `tabPayment Request Tracker`
+        SET `{tracker_field}` = NULL
+        WHERE `{tracker_field}` = ''
+        """
+    )
+
+    trackers = frappe.db.sql(
+        f"""
+        SELECT name, `{tracker_field}` AS source_name
+        FROM `tabPayment Request Tracker`
+        WHERE `{tracker_field}` IN (
+            SELECT `{tracker_field}`
+            FROM `tabPayment Request Tracker`
+            WHERE `{tracker_field}` IS NOT NULL
+            GROUP BY `{tracker_field}`
+            HAVING COUNT(*) > 1
+        )
+        ORDER BY creation, name
+        """,
+        as_dict=True,
+    )
+
+    has_tracker_link = frappe.db.has_column("Cash Management", "tracker")
+    kept = {}
+    for tracker in trackers:
+        keep = kept.setdefault(tracker.source_name, tracker.name)
+        if keep == tracker.name:
+            continue
+
+        frappe.db.sql(
+            """
+            UPDATE `tabPayment Request Details`
+            SET parent = %s
+            WHERE parenttype = 'Payment Request Tracker' AND parent = %s
+            """,
+            (keep, tracker.name),
+        )
+        if has_tracker_link:
+            frappe.db.sql("UPDATE `tabCash Management` SET tracker = %s WHERE tracker = %s", (keep, tracker.name))
+        frappe.db.delete("Payment Request Tracker", {"name": tracker.name})
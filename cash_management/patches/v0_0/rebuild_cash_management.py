@@ -0,0 +1,11 @@
+from cash_management.cash_management.doctype.cash_management.cash_management import (
+    delete_orphaned_payment_terms,
+    rebuild_cash_management,
+)
+
+
+def execute():
+    # Cash Management becomes the read model of the Payment Management pages
+    rebuild_cash_management()
+    # earlier rebuilds deleted read model rows without their payment terms
+    delete_orphaned_payment_terms()
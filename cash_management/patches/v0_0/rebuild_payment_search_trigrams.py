@@ -0,0 +1,8 @@
+from cash_management.cash_management.doctype.payment_search_trigram.payment_search_trigram import (
+    rebuild_search_trigrams,
+)
+
+
+def execute():
+    # request / reference name searches on the Payment Management pages use the trigram index
+    rebuild_search_trigrams()
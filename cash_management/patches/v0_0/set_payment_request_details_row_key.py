@@ -0,0 +1,12 @@
+import frappe
+
+
+def execute():
+    # existing rows keep their identity, so resaving a tracker does not post them again
+    frappe.db.sql(
+        """
+        UPDATE `tabPayment Request Details`
+        SET row_key = name
+        WHERE IFNULL(row_key, '') = ''
+        """
+    )